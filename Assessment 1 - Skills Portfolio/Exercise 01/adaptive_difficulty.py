@@ -0,0 +1,142 @@
+"""Adaptive difficulty: picks the next question's range from how the player is doing.
+
+The model keeps exponentially weighted averages of accuracy and response
+time plus a continuous skill value, all updated in O(1) per answer. The
+skill selects a stage on LADDER (operand range and operators) and, within
+the stage, how much of the range is used, so questions get harder or
+easier one at a time rather than per round.
+
+The state is four numbers, saved as a 24-byte record between sessions.
+"""
+import math
+import os
+import struct
+import zlib
+
+import quiz_engine
+
+# (low, high, operators) from easiest to hardest
+LADDER = (
+    (0, 9, ("+",)),
+    (0, 9, ("+", "-")),
+    (0, 20, ("+", "-")),
+    (2, 12, ("+", "-", "×")),
+    (10, 99, ("+", "-")),
+    (2, 12, quiz_engine.OPERATORS),
+    (10, 99, ("+", "-", "×")),
+    (100, 999, ("+", "-")),
+    (10, 99, quiz_engine.OPERATORS),
+    (1000, 9999, ("+", "-")),
+    (100, 999, quiz_engine.OPERATORS),
+)
+
+ALPHA = 0.25  # weight of the newest answer in the moving averages
+TARGET_ACCURACY = 0.75  # aim for about three in four right
+TARGET_SPEED = 0.4  # and answers in about 40% of the timer
+SPEED_WEIGHT = 0.5
+GAIN = 0.8  # skill change per answer at full error
+
+STATE = struct.Struct("<4sfffI")  # magic, skill, accuracy, speed, answers
+STATE_MAGIC = b"ADP1"
+
+
+class AdaptiveModel:
+    def __init__(self, skill=0.0, accuracy=TARGET_ACCURACY, speed=TARGET_SPEED, answers=0):
+        self.skill = skill
+        self.accuracy = accuracy  # EWMA of answer scores (1, 0.5 on a second try, 0)
+        self.speed = speed  # EWMA of response time as a fraction of the timer
+        self.answers = answers
+
+    @property
+    def stage(self):
+        return min(int(self.skill), len(LADDER) - 1)
+
+    def next_range(self):
+        """((low, high), operators) for the next question."""
+        low, high, operators = LADDER[self.stage]
+        # Low in a stage only the lower half of the range is used, growing to all of it
+        fraction = 0.5 + 0.5 * (self.skill - self.stage)
+        return (low, max(low + 1, low + round((high - low) * fraction))), operators
+
+    def update(self, score, seconds=None):
+        """Folds in one answered question: score 0..1, seconds taken (if known)."""
+        self.answers += 1
+        self.accuracy += ALPHA * (score - self.accuracy)
+        error = score - TARGET_ACCURACY
+        if seconds is not None:
+            speed = min(seconds / quiz_engine.SECONDS_PER_QUESTION, 1.0)
+            self.speed += ALPHA * (speed - self.speed)
+            # Quick answers nudge the skill up, slow ones down; only when correct
+            if score:
+                error += SPEED_WEIGHT * (TARGET_SPEED - speed)
+        if error > 0 and self.accuracy < TARGET_ACCURACY:
+            error *= 0.5  # a lucky answer after a bad run counts for less
+        self.skill = min(max(self.skill + GAIN * error, 0.0), len(LADDER) - 0.001)
+
+    def level_name(self):
+        (low, high), operators = self.next_range()
+        return f"Lv {self.stage + 1} ({low}-{high} {''.join(operators)})"
+
+    # ---------- persistence ----------
+    def to_bytes(self):
+        body = STATE.pack(STATE_MAGIC, self.skill, self.accuracy, self.speed, self.answers)
+        return body + struct.pack("<I", zlib.crc32(body))
+
+    @classmethod
+    def from_bytes(cls, data):
+        body, crc = data[:STATE.size], data[STATE.size:STATE.size + 4]
+        if len(crc) < 4 or struct.unpack("<I", crc)[0] != zlib.crc32(body):
+            raise ValueError("damaged adaptive state")
+        magic, skill, accuracy, speed, answers = STATE.unpack(body)
+        if magic != STATE_MAGIC or not all(map(math.isfinite, (skill, accuracy, speed))):
+            raise ValueError("not an adaptive state record")
+        return cls(skill, accuracy, speed, answers)
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp, path)
+
+
+def load_model(path):
+    """The saved model, or a fresh one if there is none (or it is damaged)."""
+    try:
+        with open(path, "rb") as f:
+            return AdaptiveModel.from_bytes(f.read())
+    except (OSError, ValueError):
+        return AdaptiveModel()
+
+
+if __name__ == "__main__":
+    # python adaptive_difficulty.py  - per-question cost and where simulated players settle
+    import random
+    import time
+
+    session = quiz_engine.QuizSession(seed=0, model=AdaptiveModel())
+    session.start(quiz_engine.ADAPTIVE)
+    timings = []
+    for _ in range(10000):
+        if session.finished:
+            session.start(quiz_engine.ADAPTIVE)
+        started = time.perf_counter()
+        question = session.next_question()
+        session.answer(question.answer, 4.0)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(f"next question + update: median {timings[5000] * 1e6:.1f} us, "
+          f"p99 {timings[9900] * 1e6:.1f} us, max {timings[-1] * 1e6:.1f} us")
+
+    # Simulated players answer right less often the further the stage is above their ability
+    rng = random.Random(1)
+    for ability in (1, 3, 6, 9):
+        model = AdaptiveModel()
+        skills, right = [], 0
+        for i in range(300):
+            correct = rng.random() < 1 / (1 + math.exp(model.skill - ability))
+            model.update(1.0 if correct else 0.0, rng.uniform(2, 8))
+            if i >= 100:
+                skills.append(model.skill)
+                right += correct
+        print(f"player ability {ability}: mean stage {sum(skills) / len(skills) + 1:.1f}, "
+              f"accuracy {right / len(skills):.2f}")
@@ -0,0 +1,100 @@
+"""Micro-benchmark: per-frame cost of the old and new video blitting paths.
+
+Old path (what play_video used to do every tick):
+    cv2.resize -> cv2.cvtColor -> Image.fromarray -> new ImageTk.PhotoImage
+New path (FrameDecoder + FramePresenter):
+    cv2.resize(dst=) -> cv2.cvtColor(dst=) -> Image.frombytes -> PhotoImage.paste
+
+Run:  python bench_frame_blit.py [frames]
+The Tk steps need a display; without one only the decode-side steps are timed.
+
+Allocations are measured per frame: "MB/frame" is the most memory
+tracemalloc saw allocated on top of the steady state during one frame
+(NumPy/OpenCV arrays), and "PIL images/frame" counts new images from
+Pillow's own allocator stats. Tk's photo memory is not traced.
+"""
+import sys
+import time
+import tracemalloc
+import tkinter as tk
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+SIZES = {"1080p": (1920, 1080), "4K": (3840, 2160)}
+SOURCE_SIZE = (1920, 1080)  # the quiz clips are 1080p
+
+
+def old_path(src, size, root):
+    frame = cv2.resize(src, size)
+    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    img = Image.fromarray(frame)
+    if root is not None:
+        return ImageTk.PhotoImage(img, master=root)
+    return img
+
+
+def make_new_path(size, root):
+    width, height = size
+    scaled = np.empty((height, width, 3), dtype=np.uint8)
+    rgb = np.empty((height, width, 3), dtype=np.uint8)
+    image = Image.new("RGB", size)
+    photo = ImageTk.PhotoImage(image, master=root) if root is not None else None
+
+    def new_path(src, size, root):
+        cv2.resize(src, size, dst=scaled)
+        cv2.cvtColor(scaled, cv2.COLOR_BGR2RGB, dst=rgb)
+        image.frombytes(rgb)
+        if photo is not None:
+            photo.paste(image)
+        return photo
+
+    return new_path
+
+
+def measure(step, src, size, root, frames):
+    step(src, size, root)  # warm up
+    start = time.perf_counter()
+    for _ in range(frames):
+        result = step(src, size, root)
+        del result
+    elapsed = time.perf_counter() - start
+
+    # A second, traced run for allocations (tracing slows it, so it is not timed)
+    tracemalloc.start()
+    images_before = Image.core.get_stats()["new_count"]
+    worst = 0
+    for _ in range(frames):
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = step(src, size, root)
+        del result
+        worst = max(worst, tracemalloc.get_traced_memory()[1] - base)
+    images = (Image.core.get_stats()["new_count"] - images_before) / frames
+    tracemalloc.stop()
+    return elapsed / frames * 1000, worst / 2**20, images
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        root = None
+        print("No display: timing decode-side steps only (no PhotoImage).")
+
+    src = np.random.randint(0, 256, (SOURCE_SIZE[1], SOURCE_SIZE[0], 3), dtype=np.uint8)
+    print(f"{'size':<6} {'path':<4} {'ms/frame':>9} {'MB/frame':>9} {'PIL images/frame':>17}")
+    for name, size in SIZES.items():
+        for label, step in (("old", old_path), ("new", make_new_path(size, root))):
+            ms, mb, images = measure(step, src, size, root, frames)
+            print(f"{name:<6} {label:<4} {ms:>9.2f} {mb:>9.1f} {images:>17.1f}")
+
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,80 @@
+import time
+app_started = time.perf_counter()  # Everything in the startup profile is timed from here
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
-import cv2
-import random
 import os
-import pygame  # For audio playback
+import sys
+import logging
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Shared helpers
+from asset_cache import load_scaled_photo, prepared_video_path  # Screen-sized images and videos cached on disk
+from video_playback import CapturePool, FrameCache, FramePresenter  # Decodes video frames off the Tk thread
+from pages import PageManager  # Owns each page's after() callbacks and media
+import quiz_engine  # Question generation and scoring rules (no Tk)
+from results_store import ResultsStore  # Results log and top-K leaderboard
+from quiz_timer import QuizTimer  # Question countdown and delayed transitions
+from adaptive_difficulty import load_model  # Adaptive mode: picks each question's range
+from quiz_client import TimeNotUp  # Classroom server: its question timer has not run out yet
 
 # ==========================
 # GLOBAL VARIABLES
 # ==========================
-score = 0  # Player score
-question_number = 0  # Current question number
-current_answer = 0  # Correct answer for the current question
-difficulty = 1  # Difficulty level (1=easy, 2=moderate, 3=advanced)
-max_questions = 10  # Total questions per game
-second_chance = True  # Allows one retry per question
-timer_seconds = 15  # Timer per question
-timer_id = None  # ID for the after() method controlling timer
+# Run with --server http://host:port to play on a classroom server (quiz_server.py)
+server_url = sys.argv[sys.argv.index("--server") + 1] if "--server" in sys.argv else None
+if server_url:
+    from quiz_client import RemoteSession
+    quiz = RemoteSession(server_url)  # Same interface; questions and score live on the server
+else:
+    quiz = quiz_engine.QuizSession()  # Score, question number, current question and second chance
+difficulty = 1  # Difficulty level (1=easy, 2=moderate, 3=advanced, 0=adaptive)
+max_questions = quiz.max_questions  # Total questions per game
+timer_seconds = quiz_engine.SECONDS_PER_QUESTION  # Timer per question
+
+# Adaptive mode learns from every answer; its state is kept between sessions
+adaptive_state_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "adaptive_state.bin")
+if not server_url:
+    quiz.model = load_model(adaptive_state_path)  # On a classroom server the server adapts instead
+
+# Memory budget for decoded background loops. Off by default: a decoded
+# 1080p loop of 150 frames is about 930 MB, so holding all four clips
+# takes QUIZ_FRAME_CACHE_MB=3800 or so. Only worth it on machines with RAM to spare.
+frame_cache_mb = int(os.environ.get("QUIZ_FRAME_CACHE_MB", "0"))
 
-# Video loop IDs for scheduling video playback
-start_after_id = None
-instruction_after_id = None
-difficulty_after_id = None
-result_after_id = None
+# ==========================
+# STARTUP PROFILE
+# ==========================
+# Run with --profile-startup to print how long each startup phase took
+profile_startup = "--profile-startup" in sys.argv
+startup_phases = []  # (phase name, ms)
+last_mark = app_started
+
+def startup_mark(phase):
+    """Records the time since the previous mark as one startup phase."""
+    global last_mark
+    now = time.perf_counter()
+    startup_phases.append((phase, (now - last_mark) * 1000))
+    last_mark = now
+
+def print_startup_profile():
+    if not profile_startup:
+        return
+    print("Startup profile:")
+    for phase, ms in startup_phases:
+        print(f"  {phase:<32} {ms:8.1f} ms")
+    print(f"  {'total':<32} {(time.perf_counter() - app_started) * 1000:8.1f} ms")
+
+startup_mark("imports")
+
+# ==========================
+# TIMING LOG
+# ==========================
+# Set QUIZ_TIMING_LOG=<file> to record startup, video open and replay latency
+timing_log = logging.getLogger("math_quiz.timing")
+if os.environ.get("QUIZ_TIMING_LOG"):
+    handler = logging.FileHandler(os.environ["QUIZ_TIMING_LOG"])
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    timing_log.addHandler(handler)
+    timing_log.setLevel(logging.INFO)
+first_frame_pending = ("startup", app_started)  # Logged when the start page shows a frame
 
 # ==========================
 # WORKING DIRECTORY
@@ -40,42 +92,60 @@ root.attributes('-topmost', True)  # Keep window on top
 root.overrideredirect(True)  # Remove default window frame
 root.bind("<Escape>", lambda e: root.destroy())  # Escape closes app
 
+# Set QUIZ_TK_PROFILE=<file.json> to time every Tk callback (F6 or exit writes the file)
+if os.environ.get("QUIZ_TK_PROFILE"):
+    import tk_instrumentation
+    tk_instrumentation.install(root, os.environ["QUIZ_TK_PROFILE"])
+    root.bind("<F6>", tk_instrumentation.dump)
+
 # Get screen dimensions
 screen_width = root.winfo_screenwidth()
 screen_height = root.winfo_screenheight()
+startup_mark("main window")
 
 # ==========================
 # AUDIO SETUP
 # ==========================
-pygame.mixer.init()  # Initialize pygame audio
 intro_music_path = "intro_music.mp3"
 quiz_music_path = "quiz_music.mp3"
 correct_audio_path = "correct.mp3"
 wrong_audio_path = "wrong.mp3"
 
+sounds = None  # SoundBank, created by init_audio() once the start page is up
+
+def init_audio():
+    """Imports pygame, starts the mixer and begins decoding every sound.
+
+    Deferred until after the first start page frame so it does not delay
+    cold start. All effects and music are decoded in the background and kept warm.
+    """
+    global sounds
+    import pygame  # For audio playback
+    from sound_bank import SoundBank
+    pygame.mixer.init()  # Initialize pygame audio
+    sounds = SoundBank(effects=[correct_audio_path, wrong_audio_path],
+                       music=[intro_music_path, quiz_music_path])
+    sounds.load()
+
 # Play background music
 def play_music(path, loop=-1, volume=0.5):
-    if os.path.exists(path):
-        pygame.mixer.music.load(path)
-        pygame.mixer.music.set_volume(volume)
-        pygame.mixer.music.play(loop)
+    if sounds:
+        sounds.play_music(path, loop, volume)
 
 # Stop background music
 def stop_music():
-    pygame.mixer.music.stop()
+    if sounds:
+        sounds.stop_music()
 
 # Play short sound effects
 def play_sound(path, volume=1.0):
-    if os.path.exists(path):
-        sound = pygame.mixer.Sound(path)
-        sound.set_volume(volume)
-        sound.play()
+    if sounds:
+        sounds.play(path, volume)
 
 # ==========================
 # CANVAS AND FRAMES
 # ==========================
-canvas = tk.Canvas(root, width=screen_width, height=screen_height, highlightthickness=0)
-canvas.pack(fill="both", expand=True)  # Main canvas covering entire window
+canvas = tk.Canvas(root, width=screen_width, height=screen_height, highlightthickness=0)  # Start page canvas
 
 # Frames for different pages
 menu_frame = tk.Frame(root, bg="#222")
@@ -85,62 +155,90 @@ next_page_frame = tk.Frame(root, bg="#222")
 difficulty_frame = tk.Frame(root, bg="#222")
 
 # ==========================
-# VIDEO CAPTURE INITIALIZATION
+# VIDEO CAPTURE POOL
 # ==========================
-def init_videos():
-    global cap_start, instructions_cap, difficulty_cap, result_cap
+# Shared between all clips; with a big enough budget replays come from memory
+frame_cache = FrameCache(frame_cache_mb) if frame_cache_mb > 0 else None
 
-    # Safely create video capture object if file exists
-    def safe_capture(file):
-        if os.path.exists(file):
-            return cv2.VideoCapture(file)
-        else:
-            print(f"Warning: Video file '{file}' not found.")
-            return None
-
-    cap_start = safe_capture("quiz2.mp4")
-    instructions_cap = safe_capture("instructions.mp4")
-    difficulty_cap = safe_capture("levels.mp4")
-    result_cap = safe_capture("result_bg.mp4")
-
-init_videos()
+# Each clip is opened once, when its page is first shown, and rewound on reuse.
+# Screen-sized copies from prepare_assets.py are used when they exist.
+video_pool = CapturePool((screen_width, screen_height), cache=frame_cache,
+                         prefer=lambda path: prepared_video_path(path, (screen_width, screen_height)))
 
 # ==========================
 # VIDEO PLAYBACK FUNCTIONS
 # ==========================
-def play_video(cap, canvas_widget, bg_id, after_var_name, frame_img_var_name):
-    """Plays video frames on the given canvas using after() loop."""
-    if cap is None:
-        return
-
-    ret, frame = cap.read()
-    if not ret:
-        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-        ret, frame = cap.read()
-    if ret:
-        frame = cv2.resize(frame, (screen_width, screen_height))
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        img = Image.fromarray(frame)
-        globals()[frame_img_var_name] = ImageTk.PhotoImage(img)
-        canvas_widget.itemconfig(bg_id, image=globals()[frame_img_var_name])
-    # Schedule next frame update
-    globals()[after_var_name] = canvas_widget.after(30, lambda: play_video(cap, canvas_widget, bg_id, after_var_name, frame_img_var_name))
+def play_page_video(page, clip, canvas_widget, bg_id, presenter_var_name):
+    """Starts a page's background clip from the pool; the page stops it on hide."""
+    cap = video_pool.get(clip)
+    page.add_media(cap)
+    play_video(page, cap, canvas_widget, bg_id, presenter_var_name)
+
+def play_video(page, cap, canvas_widget, bg_id, presenter_var_name):
+    """Shows the newest decoded frame on the given canvas using after() loop.
+
+    Decoding, scaling and colour conversion happen on the decoder's worker
+    thread, so the Tk thread only blits a ready frame. The loop is owned by
+    the page, so it stops as soon as the page is hidden.
+    """
+    if cap is None or cap.failed:
+        return  # missing, or no readable frames: leave the background as it is
+
+    cap.start()
+    frame = cap.latest_frame()
+    if frame is not None:
+        # One PhotoImage per canvas, updated in place instead of rebuilt
+        if globals()[presenter_var_name] is None:
+            globals()[presenter_var_name] = FramePresenter(canvas_widget, bg_id, (screen_width, screen_height))
+        globals()[presenter_var_name].show(frame)
+        log_first_frame(page)
+    # Schedule the next frame for when it is due at the clip's own fps
+    page.after(cap.next_display_delay_ms(),
+               lambda: play_video(page, cap, canvas_widget, bg_id, presenter_var_name), label="video")
+
+def log_first_frame(page):
+    """Logs startup / replay latency when the start page shows a frame."""
+    global first_frame_pending
+    if first_frame_pending and page is start_page:
+        timing_log.info("%s to first frame: %.1f ms", first_frame_pending[0],
+                        (time.perf_counter() - first_frame_pending[1]) * 1000)
+        if first_frame_pending[0] == "startup":
+            startup_mark("first start page frame")
+            root.after_idle(load_deferred)
+        first_frame_pending = None
+
+def print_video_stats(event=None):
+    """Prints video fps, dropped frames and lateness, plus audio latency (F3)."""
+    for cap in video_pool.decoders.values():
+        if cap is not None:
+            print(cap.stats())
+    if sounds:
+        print({"audio": sounds.stats()})
+
+root.bind("<F3>", print_video_stats)
 
 # ==========================
 # START PAGE
 # ==========================
 start_bg_id = canvas.create_image(0, 0, anchor="nw", image=None)
-start_frame_img = None
+start_presenter = None  # Reused PhotoImage for this page's video
 
 def play_start_video():
-    play_video(cap_start, canvas, start_bg_id, "start_after_id", "start_frame_img")
+    play_page_video(start_page, "quiz2.mp4", canvas, start_bg_id, "start_presenter")
 
 def create_play_button():
-    """Creates the PLAY button on the start page with hover effect."""
+    """Creates the PLAY button on the start page with hover effect (once)."""
     x1, y1 = screen_width//2 - 80, int(screen_height*0.65)-35
     x2, y2 = screen_width//2 + 80, int(screen_height*0.65)+35
     dark_yellow = "#FFD700"
 
+    existing = canvas.find_withtag("playbtn")
+    if existing:  # Already built: just clear any hover highlight left from last time
+        oval, text = existing
+        canvas.itemconfig(oval, fill="black")
+        canvas.itemconfig(text, fill=dark_yellow)
+        return
+
     # Button shape and text
     oval = canvas.create_oval(x1, y1, x2, y2, fill="black", outline=dark_yellow, width=3, tags="playbtn")
     text = canvas.create_text(screen_width//2, int(screen_height*0.65), text="PLAY ▶", fill=dark_yellow,
@@ -161,11 +259,7 @@ def create_play_button():
 
     # Click event to move to instructions page
     def click(event):
-        if cap_start: cap_start.release()
-        canvas.pack_forget()
-        next_page_frame.pack(fill="both", expand=True)
-        play_instructions_video()
-        create_next_button()
+        pages.show("instructions")
 
     canvas.tag_bind(oval, "<Button-1>", click)
     canvas.tag_bind(text, "<Button-1>", click)
@@ -176,17 +270,24 @@ def create_play_button():
 instructions_canvas = tk.Canvas(next_page_frame, width=screen_width, height=screen_height, highlightthickness=0)
 instructions_canvas.pack(fill="both", expand=True)
 instructions_bg_id = instructions_canvas.create_image(0, 0, anchor="nw", image=None)
-instructions_frame_img = None
+instructions_presenter = None  # Reused PhotoImage for this page's video
 
 def play_instructions_video():
-    play_video(instructions_cap, instructions_canvas, instructions_bg_id, "instruction_after_id", "instructions_frame_img")
+    play_page_video(instructions_page, "instructions.mp4", instructions_canvas, instructions_bg_id, "instructions_presenter")
 
 def create_next_button():
-    """Creates NEXT button for instructions page with hover effect."""
+    """Creates NEXT button for instructions page with hover effect (once)."""
     x1, y1 = int(screen_width*0.65) - 80, int(screen_height*0.85) - 35
     x2, y2 = int(screen_width*0.65) + 80, int(screen_height*0.85) + 35
     med_yellow = "#DAA520"
 
+    existing = instructions_canvas.find_withtag("nextbtn")
+    if existing:  # Already built: just clear any hover highlight left from last time
+        oval, text = existing
+        instructions_canvas.itemconfig(oval, fill="black")
+        instructions_canvas.itemconfig(text, fill=med_yellow)
+        return
+
     oval = instructions_canvas.create_oval(x1, y1, x2, y2, fill="black", outline=med_yellow, width=3, tags="nextbtn")
     text = instructions_canvas.create_text(int(screen_width*0.65), int(screen_height*0.85),
                                            text="NEXT ➡", fill=med_yellow, font=("Helvetica", 20, "bold"), tags="nextbtn")
@@ -205,11 +306,7 @@ def create_next_button():
 
     # Click event to go to difficulty selection page
     def click(event):
-        if instructions_cap: instructions_cap.release()
-        next_page_frame.pack_forget()
-        difficulty_frame.pack(fill="both", expand=True)
-        play_difficulty_video()
-        create_difficulty_buttons()
+        pages.show("difficulty")
 
     instructions_canvas.tag_bind(oval, "<Button-1>", click)
     instructions_canvas.tag_bind(text, "<Button-1>", click)
@@ -220,19 +317,24 @@ def create_next_button():
 difficulty_canvas = tk.Canvas(difficulty_frame, width=screen_width, height=screen_height, bg="#111", highlightthickness=0)
 difficulty_canvas.pack(fill="both", expand=True)
 difficulty_bg_id = difficulty_canvas.create_image(0, 0, anchor="nw", image=None)
-difficulty_frame_img = None
+difficulty_presenter = None  # Reused PhotoImage for this page's video
 
 def play_difficulty_video():
-    play_video(difficulty_cap, difficulty_canvas, difficulty_bg_id, "difficulty_after_id", "difficulty_frame_img")
+    play_page_video(difficulty_page, "levels.mp4", difficulty_canvas, difficulty_bg_id, "difficulty_presenter")
 
 def create_difficulty_buttons():
-    """Creates difficulty buttons with hover effect and click logic."""
-    difficulty_canvas.delete("diffbtn")
+    """Creates difficulty buttons with hover effect and click logic (once)."""
     options = [
         ("Easy (1-digit) 🐣", 1, "#6aff6a", "#00b300"),
         ("Moderate (2-digit) 🐱", 2, "#ffd966", "#ff9900"),
-        ("Advanced (4-digit) 🦄", 3, "#ff6ab3", "#ff1a75")
+        ("Advanced (4-digit) 🦄", 3, "#ff6ab3", "#ff1a75"),
+        ("Adaptive (auto) 🧠", quiz_engine.ADAPTIVE, "#6ad1ff", "#0077cc")
     ]
+    if difficulty_canvas.find_withtag("diffbtn"):  # Already built: clear hover highlights
+        for i in range(len(options)):
+            difficulty_canvas.itemconfig(f"shadow_{i}", fill="#000")
+            difficulty_canvas.itemconfig(f"text_{i}", fill="white")
+        return
     start_y = int(screen_height * 0.40)
     gap = 100
 
@@ -273,14 +375,14 @@ def create_difficulty_buttons():
                     msg = "There are 10 single-digit questions.\nAre you ready? 🎉"
                 elif lvl == 2:
                     msg = "There are 10 two-digit questions.\nAre you ready? 🎉"
+                elif lvl == quiz_engine.ADAPTIVE:
+                    msg = "10 questions that get harder or easier as you go.\nAre you ready? 🎉"
                 else:
                     msg = "There are 10 four-digit questions.\nAre you ready? 🎉"
                 answer = messagebox.askquestion("Start Level?", msg)
                 if answer == "yes":
                     global difficulty
                     difficulty = lvl
-                    if difficulty_cap: difficulty_cap.release()
-                    difficulty_frame.pack_forget()
                     stop_music()
                     play_music(quiz_music_path, loop=-1, volume=0.4)
                     start_quiz(difficulty)
@@ -296,16 +398,21 @@ def create_difficulty_buttons():
 quiz_canvas = tk.Canvas(quiz_frame, width=screen_width, height=screen_height, highlightthickness=0)
 quiz_canvas.pack(fill="both", expand=True)
 
-# Background image for quiz
+# Background image for quiz (loaded at idle time or when the quiz is first shown)
 quiz_bg_path = os.path.join(script_dir, "quiz_bg.jpg")
-if os.path.exists(quiz_bg_path):
-    quiz_bg_img = Image.open(quiz_bg_path).resize((screen_width, screen_height), Image.Resampling.LANCZOS)
-    quiz_bg_photo = ImageTk.PhotoImage(quiz_bg_img)
-    quiz_canvas.bg_image_ref = quiz_bg_photo
-    quiz_canvas.create_image(0, 0, anchor="nw", image=quiz_canvas.bg_image_ref)
-else:
-    quiz_canvas.create_rectangle(0, 0, screen_width, screen_height, fill="black")
-    print(f"Warning: Quiz background not found at {quiz_bg_path}")
+quiz_bg_id = quiz_canvas.create_image(0, 0, anchor="nw", image=None)
+quiz_canvas.bg_image_ref = None
+
+def load_quiz_background():
+    if quiz_canvas.bg_image_ref is not None:
+        return
+    if os.path.exists(quiz_bg_path):
+        quiz_canvas.bg_image_ref = load_scaled_photo(quiz_bg_path, (screen_width, screen_height), "LANCZOS", master=root)
+        quiz_canvas.itemconfig(quiz_bg_id, image=quiz_canvas.bg_image_ref)
+    else:
+        quiz_canvas.bg_image_ref = False  # don't look again
+        quiz_canvas.create_rectangle(0, 0, screen_width, screen_height, fill="black")
+        print(f"Warning: Quiz background not found at {quiz_bg_path}")
 
 # Labels and frames for questions, timer, options
 question_number_label = tk.Label(quiz_canvas, text="", font=("Comic Sans MS", 24, "bold"),
@@ -333,7 +440,7 @@ timer_label.place(relx=1.0, rely=0.0, anchor="ne", x=-10, y=10)
 # Options frame
 options_frame = tk.Frame(quiz_canvas, bg="#ec3b27")
 options_frame.place(relx=0.5, rely=0.5, anchor="n")
-option_buttons = []
+option_buttons = []  # Answer buttons, reused for every question
 
 # Feedback and score labels
 feedback_label = tk.Label(quiz_canvas, text="", font=("Comic Sans MS",18), fg="orange", bg="#222")
@@ -345,103 +452,114 @@ score_label.place(relx=0.5, rely=0.85, anchor="center")
 # ==========================
 # QUIZ LOGIC + TIMER
 # ==========================
+def choose_option(index):
+    """Answer button handler: answers with the option shown on button index."""
+    if quiz.question is not None:
+        check_answer(quiz.question.options[index])
+
 def display_options(options):
-    """Displays answer buttons for the current question."""
-    global option_buttons
-    for btn in option_buttons:
-        btn.destroy()
-    option_buttons = []
-    for i, opt in enumerate(options):
-        btn = tk.Button(options_frame, text=opt, font=("Arial", 18, "bold"),
+    """Shows the options on the pooled answer buttons (created only once)."""
+    while len(option_buttons) < len(options):
+        btn = tk.Button(options_frame, text="", font=("Arial", 18, "bold"),
                         width=5, height=2, bg="#f8c291", fg="black",
-                        command=lambda val=opt: check_answer(val))
-        btn.grid(row=0, column=i, padx=10)
+                        command=lambda i=len(option_buttons): choose_option(i))
+        btn.grid(row=0, column=len(option_buttons), padx=10)
         option_buttons.append(btn)
+    for i, btn in enumerate(option_buttons):
+        if i < len(options):
+            btn.config(text=options[i])
+            btn.grid()
+        else:
+            btn.grid_remove()  # Fewer options this time: hide the spare button
 
-def random_int():
-    """Generates two random numbers based on difficulty level."""
-    if difficulty == 1:
-        return random.randint(0,9), random.randint(0,9)
-    elif difficulty == 2:
-        return random.randint(10,99), random.randint(10,99)
-    else:
-        return random.randint(1000,9999), random.randint(1000,9999)
+def show_time_left(seconds):
+    """Updates the timer label; the timer only calls this when the second changes."""
+    timer_label.config(text=f"⏱️ {seconds}", fg="red" if seconds <= 5 else "yellow")
 
-def decide_operation():
-    """Randomly selects addition or subtraction."""
-    return random.choice(['+','-'])
+def server_lost(error):
+    """A classroom server request failed mid-round: report it and go back to the menu."""
+    timer.reset()
+    stop_music()
+    messagebox.showerror("Quiz Server", f"Lost contact with the quiz server:\n{error}")
+    pages.show("difficulty")
+
+def time_up():
+    try:
+        quiz.timeout()
+    except TimeNotUp:
+        timer.transition(200, time_up)  # Our deadline fired just before the server's: ask again
+        return
+    except OSError as error:  # Classroom server unreachable or refused
+        server_lost(error)
+        return
+    feedback_label.config(text=f"❌ Time's up! The answer was {quiz.question.answer}", fg="black", bg="#f44336")
+    play_sound(wrong_audio_path)
+    timer.transition(1200, next_question)
 
 def start_timer():
     """Starts the countdown timer for a question."""
-    global timer_seconds, timer_id
-    timer_seconds = 15
-    def countdown():
-        global timer_seconds, timer_id
-        if timer_seconds >= 0:
-            timer_label.config(text=f"⏱️ {timer_seconds}")
-            if timer_seconds <= 5:
-                timer_label.config(fg="red")
-            else:
-                timer_label.config(fg="yellow")
-            timer_seconds -= 1
-            timer_id = quiz_frame.after(1000, countdown)
-        else:
-            feedback_label.config(text=f"❌ Time's up! The answer was {current_answer}", fg="black", bg="#f44336")
-            play_sound(wrong_audio_path)
-            quiz_frame.after(1200, next_question)
-    countdown()
+    timer.start(timer_seconds)
 
 def next_question():
     """Loads the next question or ends quiz if max_questions reached."""
-    global num1, num2, operation, current_answer, question_number, second_chance, timer_id
     feedback_label.config(text="")
-    second_chance = True
-    if timer_id: quiz_frame.after_cancel(timer_id)
-    if question_number >= max_questions:
+    timer.stop()
+    try:
+        question = quiz.next_question()
+    except OSError as error:  # Classroom server unreachable or refused
+        server_lost(error)
+        return
+    if question is None:
         stop_music()
         show_final_score()
         return
-    num1, num2 = random_int()
-    operation = decide_operation()
-    current_answer = num1 + num2 if operation == '+' else num1 - num2
-    options = [current_answer, current_answer + random.randint(1,5), current_answer - random.randint(1,5)]
-    random.shuffle(options)
-    question_number_label.config(text=f"Question {question_number + 1}/{max_questions}")
-    question_label.config(text=f"{num1} {operation} {num2} = ? 🤔")
-    display_options(options)
-    question_number += 1
+    if quiz.difficulty == quiz_engine.ADAPTIVE:
+        question_number_label.config(text=f"Q {quiz.question_number}/{max_questions} · Lv {quiz.level}")
+    else:
+        question_number_label.config(text=f"Question {quiz.question_number}/{max_questions}")
+    question_label.config(text=f"{question.num1} {question.operation} {question.num2} = ? 🤔")
+    display_options(question.options)
     start_timer()
 
 def check_answer(ans):
     """Checks user's answer and updates score/feedback."""
-    global score, second_chance, timer_id
-    if timer_id: quiz_frame.after_cancel(timer_id)
-    if ans == current_answer:
-        score += 10 if second_chance else 5
+    if timer.transition_pending or quiz.question is None:
+        timer.ignored(f"answer {ans}")  # Already moving on to the next question
+        return
+    seconds_taken = timer_seconds - timer.remaining
+    timer.stop()
+    try:
+        outcome = quiz.answer(ans, seconds_taken)
+    except OSError as error:  # Classroom server unreachable or refused
+        server_lost(error)
+        return
+    if outcome == quiz_engine.CORRECT:
         feedback_label.config(text="🎉 Correct! 👍", fg="#31DA56", bg="#f86150")
-        score_label.config(text=f"Score: {score}")
+        score_label.config(text=f"Score: {quiz.score}")
         play_sound(correct_audio_path)
-        quiz_canvas.after(1200, next_question)
+        timer.transition(1200, next_question)
     else:
-        if second_chance:
+        if outcome == quiz_engine.RETRY:
             feedback_label.config(text="❌ Oops! Try Again! 💡", fg="yellow", bg="#f44336")
             play_sound(wrong_audio_path)
-            second_chance = False
             start_timer()
         else:
-            feedback_label.config(text=f"❌ Wrong! The answer was {current_answer}", fg="black", bg="#f44336")
+            feedback_label.config(text=f"❌ Wrong! The answer was {quiz.question.answer}", fg="black", bg="#f44336")
             play_sound(wrong_audio_path)
-            quiz_canvas.after(1200, next_question)
+            timer.transition(1200, next_question)
 
 def start_quiz(level):
     """Initializes quiz at selected difficulty."""
-    global difficulty, score, question_number
+    global difficulty
     difficulty = level
-    score = 0
-    question_number = 0
-    difficulty_frame.pack_forget()
-    quiz_frame.pack(fill="both", expand=True)
-    score_label.config(text=f"Score: {score}")
+    try:
+        quiz.start(level)
+    except OSError as error:  # Classroom server unreachable
+        messagebox.showerror("Quiz Server", f"Could not reach the quiz server:\n{error}")
+        return
+    timer.reset()
+    pages.show("quiz")
+    score_label.config(text=f"Score: {quiz.score}")
     feedback_label.config(text="")
     next_question()
 
@@ -451,16 +569,29 @@ def start_quiz(level):
 result_canvas = tk.Canvas(result_frame, width=screen_width, height=screen_height, highlightthickness=0)
 result_canvas.pack(fill="both", expand=True)
 result_bg_id = result_canvas.create_image(0, 0, anchor="nw", image=None)
-result_frame_img = None
+result_presenter = None  # Reused PhotoImage for this page's video
 
 def play_result_video():
-    play_video(result_cap, result_canvas, result_bg_id, "result_after_id", "result_frame_img")
+    play_page_video(result_page, "result_bg.mp4", result_canvas, result_bg_id, "result_presenter")
 
 # Result label and buttons
 result_label = tk.Label(result_canvas, text="", font=("Helvetica", 28),
                         fg="white", bg="black", justify="center")
 result_label.place(relx=0.35, rely=0.55, anchor="center")
 
+# Leaderboard: best scores for the level just played
+results = ResultsStore()  # Loads only the saved top-K per level, not the whole log
+difficulty_names = {quiz_engine.ADAPTIVE: "Adaptive", 1: "Easy", 2: "Moderate", 3: "Advanced"}
+leaderboard_label = tk.Label(result_canvas, text="", font=("Helvetica", 18),
+                             fg="#FFD700", bg="black", justify="left")
+leaderboard_label.place(relx=0.72, rely=0.55, anchor="center")
+
+def update_leaderboard(level, limit=5):
+    lines = [f"🏆 Top Scores ({difficulty_names[level]})"]
+    for place, (score, played_at) in enumerate(results.leaderboard(level, limit), start=1):
+        lines.append(f"{place}. {score:>3}   {time.strftime('%d %b %Y', time.localtime(played_at))}")
+    leaderboard_label.config(text="\n".join(lines))
+
 play_again_btn = tk.Button(result_canvas, text="Play Again ▶", font=("Helvetica", 20),
                            bg="black", fg="#FFD700", bd=3, relief="raised")
 play_again_btn.place(relx=0.30, rely=0.7, anchor="center")
@@ -486,64 +617,95 @@ def quit_quiz():
     if answer == "yes":
         root.destroy()
     else:
-        result_frame.pack_forget()
-        canvas.pack(fill="both", expand=True)
         play_again()
 
 quit_btn.config(command=quit_quiz)
 
 # Display final score and rank
 def show_final_score():
-    quiz_frame.pack_forget()
-    result_frame.pack(fill="both", expand=True)
-    play_result_video()
-    final_score = min(int((score / (max_questions*10)) * 100), 100)
-    if final_score >= 90:
-        rank = "A+ 🌟"
-        msg = "You're a Maths Genius! 🧠✨"
-    elif final_score >= 80:
-        rank = "A 🎉"
-        msg = "Great Job! Keep it up! 💪"
-    elif final_score >= 70:
-        rank = "B 👍"
-        msg = "Well Done! You can do better! 😊"
-    else:
-        rank = "C 😅"
-        msg = "Keep Practicing! You got this! 💡"
-    result_label.config(text=f"Score: {score}/{max_questions*10}\nRank: {rank}\n{msg}")
+    pages.show("result")
+    final_score, rank, msg = quiz.result()
+    result_label.config(text=f"Score: {quiz.score}/{max_questions*10}\nRank: {rank}\n{msg}")
+    results.record(quiz.difficulty, quiz.score)
+    if quiz.difficulty == quiz_engine.ADAPTIVE and quiz.model is not None:
+        quiz.model.save(adaptive_state_path)
+    update_leaderboard(quiz.difficulty)
 
 # Play again logic
 def play_again():
-    global cap_start, instructions_cap, difficulty_cap, result_cap
-    global start_after_id, instruction_after_id, difficulty_after_id, result_after_id
-
-    # Cancel any running video loops
-    if start_after_id: canvas.after_cancel(start_after_id)
-    if instruction_after_id: instructions_canvas.after_cancel(instruction_after_id)
-    if difficulty_after_id: difficulty_canvas.after_cancel(difficulty_after_id)
-    if result_after_id: result_canvas.after_cancel(result_after_id)
-
-    # Release video captures
-    if cap_start: cap_start.release()
-    if instructions_cap: instructions_cap.release()
-    if difficulty_cap: difficulty_cap.release()
-    if result_cap: result_cap.release()
-
-    # Reinitialize videos
-    init_videos()
+    # Pooled videos are rewound when their pages are shown again, not re-opened
+    global first_frame_pending
+    first_frame_pending = ("play_again", time.perf_counter())
     stop_music()
     play_music(intro_music_path, loop=-1, volume=0.9)
-    result_frame.pack_forget()
-    canvas.pack(fill="both", expand=True)
-    create_play_button()
-    play_start_video()
+    pages.show("start")
 
 play_again_btn.config(command=play_again)
 
+# ==========================
+# PAGES
+# ==========================
+# Each page starts its video and buttons when shown; hiding a page cancels
+# its after() loops and stops its video decoder.
+def show_start_page(page):
+    play_start_video()
+    create_play_button()
+
+def show_instructions_page(page):
+    play_instructions_video()
+    create_next_button()
+
+def show_difficulty_page(page):
+    play_difficulty_video()
+    create_difficulty_buttons()
+
+def show_quiz_page(page):
+    load_quiz_background()  # no-op once the idle-time load has run
+
+def show_result_page(page):
+    play_result_video()
+
+pages = PageManager(root)
+start_page = pages.add("start", canvas, on_show=show_start_page)
+instructions_page = pages.add("instructions", next_page_frame, on_show=show_instructions_page)
+difficulty_page = pages.add("difficulty", difficulty_frame, on_show=show_difficulty_page)
+quiz_page = pages.add("quiz", quiz_frame, on_show=show_quiz_page)
+result_page = pages.add("result", result_frame, on_show=show_result_page)
+timer = QuizTimer(quiz_page, on_tick=show_time_left, on_expire=time_up)  # Runs on the quiz page's after()
+
+def print_timer_trace(event=None):
+    """Prints the quiz timer's recent events (F5)."""
+    print("\n".join(timer.trace_lines()))
+
+root.bind("<F5>", print_timer_trace)
+root.bind("<F4>", pages.show_debug)  # Debug view of live after IDs per page
+
+startup_mark("pages and widgets")
+
+# ==========================
+# DEFERRED STARTUP WORK
+# ==========================
+deferred_loaded = False
+
+def load_deferred():
+    """Loads what the start page does not need, once it is on screen."""
+    global deferred_loaded
+    if deferred_loaded:
+        return
+    deferred_loaded = True
+    init_audio()
+    play_music(intro_music_path, loop=-1, volume=0.9)  # Play intro music
+    startup_mark("audio (deferred)")
+    load_quiz_background()
+    startup_mark("quiz background (deferred)")
+    print_startup_profile()
+
 # ==========================
 # START APPLICATION
 # ==========================
-play_music(intro_music_path, loop=-1, volume=0.9)  # Play intro music
-play_start_video()  # Start video on start page
-create_play_button()  # Display start button
+pages.show("start")  # Start video and button on start page
+startup_mark("start page shown")
+root.after(2000, load_deferred)  # In case the start video never shows a frame
 root.mainloop()  # Launch main loop
+video_pool.release_all()  # Close every pooled capture on exit
+results.close()  # Write any buffered results
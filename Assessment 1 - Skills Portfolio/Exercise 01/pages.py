@@ -0,0 +1,142 @@
+import tkinter as tk
+
+# ==========================
+# PAGE
+# ==========================
+class Page:
+    """One screen of the app, owning its scheduled callbacks and media.
+
+    Every after() callback for the page goes through Page.after so it can
+    be cancelled when the page is hidden. Media objects (anything with a
+    stop() method, e.g. a FrameDecoder) are stopped on hide too.
+    """
+
+    def __init__(self, name, frame, on_show=None, on_hide=None):
+        self.name = name
+        self.frame = frame
+        self.on_show = on_show
+        self.on_hide = on_hide
+        self.visible = False
+        self.after_ids = {}  # live after ID -> label
+        self.media = []
+
+    def after(self, ms, func, label=None):
+        """Schedules func on this page; ignored while the page is hidden."""
+        if not self.visible:
+            return None
+
+        label = label or getattr(func, "__name__", "callback")
+
+        def fire():
+            self.after_ids.pop(after_id, None)
+            func()
+
+        fire.__name__ = f"{self.name}.{label}"  # Shows up in Tk command names and timings
+        after_id = self.frame.after(ms, fire)
+        self.after_ids[after_id] = label
+        return after_id
+
+    def cancel(self, after_id):
+        """Cancels one callback scheduled with Page.after."""
+        if after_id in self.after_ids:
+            del self.after_ids[after_id]
+            self.frame.after_cancel(after_id)
+
+    def cancel_all(self):
+        for after_id in list(self.after_ids):
+            self.cancel(after_id)
+
+    def add_media(self, media):
+        """Registers media to be stopped when the page is hidden."""
+        if media is not None and media not in self.media:
+            self.media.append(media)
+
+    def stop_media(self):
+        for media in self.media:
+            media.stop()
+        self.media = []
+
+    def widget_counts(self):
+        """(widgets, canvas items) under this page's frame, for leak checks."""
+        widgets, items = 0, 0
+        pending = [self.frame]
+        while pending:
+            widget = pending.pop()
+            widgets += 1
+            if isinstance(widget, tk.Canvas):
+                items += len(widget.find_all())
+            pending.extend(widget.winfo_children())
+        return widgets, items
+
+
+# ==========================
+# PAGE MANAGER
+# ==========================
+class PageManager:
+    """Shows one page at a time and cleans up the page being left."""
+
+    def __init__(self, root):
+        self.root = root
+        self.pages = {}
+        self.current = None
+        self._debug_window = None
+
+    def add(self, name, frame, on_show=None, on_hide=None):
+        page = Page(name, frame, on_show, on_hide)
+        self.pages[name] = page
+        return page
+
+    def hide_current(self):
+        page = self.current
+        if page is None:
+            return
+        self.current = None
+        page.visible = False
+        page.cancel_all()
+        page.stop_media()
+        if page.on_hide:
+            page.on_hide(page)
+        page.frame.pack_forget()
+
+    def show(self, name):
+        """Hides the current page (cancelling its callbacks) and shows name."""
+        self.hide_current()
+        page = self.pages[name]
+        self.current = page
+        page.visible = True
+        page.frame.pack(fill="both", expand=True)
+        if page.on_show:
+            page.on_show(page)
+        return page
+
+    # ---------- debug view ----------
+    def debug_lines(self):
+        lines = []
+        for page in self.pages.values():
+            state = "shown" if page.visible else "hidden"
+            widgets, items = page.widget_counts()
+            lines.append(f"[{page.name}] {state}, {len(page.after_ids)} live after IDs, {len(page.media)} media, "
+                         f"{widgets} widgets, {items} canvas items")
+            for after_id, label in page.after_ids.items():
+                lines.append(f"    {after_id}: {label}")
+        return lines
+
+    def show_debug(self, event=None):
+        """Opens (or closes) a small window listing live after IDs per page."""
+        if self._debug_window is not None:
+            self._debug_window.destroy()
+            self._debug_window = None
+            return
+        window = tk.Toplevel(self.root)
+        window.title("Pages")
+        window.attributes("-topmost", True)
+        label = tk.Label(window, font=("Courier", 12), justify="left", anchor="nw", bg="black", fg="#6aff6a")
+        label.pack(fill="both", expand=True)
+        self._debug_window = window
+
+        def refresh():
+            if self._debug_window is window and window.winfo_exists():
+                label.config(text="\n".join(self.debug_lines()))
+                window.after(500, refresh)
+
+        refresh()
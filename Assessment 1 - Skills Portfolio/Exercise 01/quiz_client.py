@@ -0,0 +1,135 @@
+"""Thin client for quiz_server.py with the same interface as QuizSession.
+
+math_quiz.py --server <url> swaps its local QuizSession for a
+RemoteSession; the widgets, timer and sounds stay in the Tk app while the
+questions and score live on the classroom server.
+"""
+import http.client
+import json
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+import quiz_engine
+
+RemoteQuestion = namedtuple("RemoteQuestion", "num1 operation num2 answer options")
+
+
+class ServerError(OSError):
+    """The server refused a request (unknown session, stale question, ...)."""
+
+
+class TimeNotUp(ServerError):
+    """A timeout reached the server just before its own timer ran out; try again shortly."""
+
+
+TIME_NOT_UP = "time is not up yet"  # quiz_server's message for that case
+
+
+class _Reply(dict):
+    """A decoded JSON object; a missing field is a bad reply, not a KeyError."""
+
+    def __missing__(self, key):
+        raise ServerError(f"server reply has no {key!r}")
+
+
+class RemoteSession:
+    def __init__(self, url, request_timeout=5.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.request_timeout = request_timeout
+        self._conn = None
+        self.session_id = None
+        self.model = None  # adaptive difficulty runs on the server
+        self.max_questions = quiz_engine.MAX_QUESTIONS
+        self._apply({"difficulty": 1, "score": 0, "question_number": 0, "second_chance": True})
+        self.question = None
+
+    # ---------- HTTP ----------
+    def _request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if data else {}
+        for attempt in range(2):  # reconnect once if the kept-alive connection dropped
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.request_timeout)
+            try:
+                self._conn.request(method, path, body=data, headers=headers)
+                response = self._conn.getresponse()
+                body = response.read()
+                break
+            except (ConnectionError, http.client.HTTPException):
+                self._conn.close()
+                self._conn = None
+                if attempt:
+                    raise
+        try:
+            payload = json.loads(body or b"{}", object_hook=_Reply)
+        except ValueError:  # truncated or not JSON at all (e.g. a proxy's error page)
+            payload = None
+        if not isinstance(payload, _Reply):
+            self._conn.close()
+            self._conn = None
+            raise ServerError(f"bad reply from server ({response.status} {response.reason})")
+        if response.status >= 400:
+            error = payload.get("error", response.reason)
+            raise (TimeNotUp if error == TIME_NOT_UP else ServerError)(error)
+        return payload
+
+    def _apply(self, state):
+        self.difficulty = state["difficulty"]
+        self.level = state.get("level", self.difficulty)
+        self.score = state["score"]
+        self.question_number = state["question_number"]
+        self.second_chance = state["second_chance"]
+        self.max_questions = state.get("max_questions", self.max_questions)
+        question = state.get("question")
+        if question is None:
+            self.question = None
+        else:  # the answer is only sent once the question is closed
+            self.question = RemoteQuestion(question["num1"], question["operation"], question["num2"],
+                                           question.get("answer"), question["options"])
+        return state
+
+    def _close_question(self, action, body):
+        """Answers or times out the open question.
+
+        If the server already closed it (its own timer fired first), the
+        server's outcome is used instead.
+        """
+        try:
+            state = self._request("POST", f"/sessions/{self.session_id}/{action}", body)
+        except ServerError:
+            state = self._request("GET", f"/sessions/{self.session_id}")
+            if state["open"]:
+                raise
+        return self._apply(state)["outcome"]
+
+    # ---------- QuizSession interface ----------
+    def start(self, difficulty):
+        if self.session_id is not None:
+            try:
+                self._request("DELETE", f"/sessions/{self.session_id}")
+            except (ServerError, OSError):
+                pass
+        state = self._request("POST", "/sessions", {"difficulty": difficulty})
+        self.session_id = state["session"]
+        self.question = None
+        self._apply(state)
+
+    @property
+    def finished(self):
+        return self.question_number >= self.max_questions
+
+    def next_question(self):
+        state = self._apply(self._request("POST", f"/sessions/{self.session_id}/next"))
+        return None if state["finished"] else self.question
+
+    def answer(self, value, seconds=None):
+        return self._close_question("answer", {"question": self.question_number, "value": value,
+                                               "seconds": seconds})
+
+    def timeout(self):
+        return self._close_question("timeout", {"question": self.question_number})
+
+    def result(self):
+        return quiz_engine.final_result(self.score, self.max_questions)
@@ -0,0 +1,366 @@
+"""Question generation and scoring for the maths quiz, without any Tk.
+
+math_quiz.py uses this one question at a time; generate_batch() builds
+whole rounds (or millions of questions) at once with NumPy for worksheet
+export and simulations.
+"""
+import csv
+import itertools
+import random
+from collections import namedtuple
+
+import numpy as np
+
+# ==========================
+# RULES
+# ==========================
+OPERATORS = ("+", "-", "×", "÷")
+DEFAULT_OPERATORS = ("+", "-")  # what the quiz asks by default
+
+# Operand range per difficulty (1=easy, 2=moderate, 3=advanced)
+DIGIT_RANGES = {1: (0, 9), 2: (10, 99), 3: (1000, 9999)}
+ADAPTIVE = 0  # difficulty chosen question by question by an adaptive model
+
+# Wrong options sit this far from the answer (never 0, so never the answer)
+DISTRACTOR_OFFSETS = (-5, -4, -3, -2, -1, 1, 2, 3, 4, 5)
+
+MAX_QUESTIONS = 10
+POINTS_FIRST_TRY = 10
+POINTS_SECOND_TRY = 5
+
+Question = namedtuple("Question", "num1 operation num2 answer options")
+
+
+def random_int(difficulty, rng=random):
+    """Returns two random operands in the range for the difficulty level."""
+    low, high = DIGIT_RANGES[difficulty]
+    return rng.randint(low, high), rng.randint(low, high)
+
+
+def decide_operation(operators=DEFAULT_OPERATORS, rng=random):
+    """Randomly picks one of the allowed operators."""
+    return rng.choice(operators)
+
+
+def calculate(num1, operation, num2):
+    if operation == "+":
+        return num1 + num2
+    if operation == "-":
+        return num1 - num2
+    if operation == "×":
+        return num1 * num2
+    return num1 // num2
+
+
+def build_options(answer, rng=random, count=3):
+    """Returns the answer plus count-1 distinct distractors, shuffled."""
+    offsets = rng.sample(DISTRACTOR_OFFSETS, count - 1)
+    options = [answer] + [answer + offset for offset in offsets]
+    rng.shuffle(options)
+    return options
+
+
+def points_for(correct, second_chance):
+    """Points for an answer: 10 on the first try, 5 on the second."""
+    if not correct:
+        return 0
+    return POINTS_FIRST_TRY if second_chance else POINTS_SECOND_TRY
+
+
+def final_result(score, max_questions=MAX_QUESTIONS):
+    """Returns (percentage, rank, message) for a finished round."""
+    final_score = min(int((score / (max_questions * POINTS_FIRST_TRY)) * 100), 100)
+    if final_score >= 90:
+        return final_score, "A+ 🌟", "You're a Maths Genius! 🧠✨"
+    elif final_score >= 80:
+        return final_score, "A 🎉", "Great Job! Keep it up! 💪"
+    elif final_score >= 70:
+        return final_score, "B 👍", "Well Done! You can do better! 😊"
+    return final_score, "C 😅", "Keep Practicing! You got this! 💡"
+
+
+# ==========================
+# QUESTION BANK (one session)
+# ==========================
+def _operands(digit_range, operation, rng):
+    """Operands for one question; division always has a whole answer."""
+    low, high = digit_range
+    num1, num2 = rng.randint(low, high), rng.randint(low, high)
+    if operation == "÷":
+        num2 = max(num2, 1)
+        num1 = num1 * num2  # num1 / num2 == the original num1
+    return num1, num2
+
+
+class QuestionBank:
+    """Seedable question source that never repeats a question in a session."""
+
+    def __init__(self, seed=None, operators=DEFAULT_OPERATORS):
+        self.seed = seed
+        self.operators = tuple(operators)
+        self.rng = random.Random(seed)
+        self._np_rng = None
+        self.reset()
+
+    @property
+    def np_rng(self):
+        """NumPy generator for batches, only created when first needed."""
+        if self._np_rng is None:
+            self._np_rng = np.random.default_rng(self.seed)
+        return self._np_rng
+
+    def reset(self):
+        """Starts a new session: every question becomes available again."""
+        self._asked = set()  # keys of questions from next_question
+        self._seen_keys = np.empty(0, dtype=np.int64)  # sorted keys from generate
+
+    def _was_asked(self, key):
+        if key in self._asked:
+            return True
+        if not len(self._seen_keys):
+            return False
+        index = np.searchsorted(self._seen_keys, key)
+        return index < len(self._seen_keys) and self._seen_keys[index] == key
+
+    def next_question(self, difficulty, attempts=1000):
+        return self.next_question_for(DIGIT_RANGES[difficulty], self.operators, attempts)
+
+    def next_question_for(self, digit_range, operators, attempts=1000):
+        """A new question with operands in digit_range (low, high) and one of operators."""
+        for _ in range(attempts):
+            operation = decide_operation(operators, self.rng)
+            num1, num2 = _operands(digit_range, operation, self.rng)
+            key = _question_key(num1, OPERATORS.index(operation), num2)
+            if not self._was_asked(key):
+                break
+        else:
+            raise RuntimeError("No unused questions left in this range")
+        self._asked.add(key)
+        answer = calculate(num1, operation, num2)
+        return Question(num1, operation, num2, answer, build_options(answer, self.rng))
+
+    def generate(self, n, difficulty, unique=True):
+        """Generates n questions at once (see generate_batch).
+
+        With unique=True, questions already asked in this session (by
+        generate or next_question) are never returned again. That costs one
+        sort per batch plus a merge into the sorted keys already seen; see
+        the benchmark at the bottom of this file for both rates.
+        """
+        if not unique:
+            return generate_batch(n, difficulty, self.operators, self.np_rng)
+        # Move next_question's keys into the sorted array once, so each batch checks one array
+        if self._asked:
+            asked = np.fromiter(self._asked, dtype=np.int64, count=len(self._asked))
+            self._seen_keys = _merge_sorted(self._seen_keys, np.sort(asked))
+            self._asked = set()
+        seen = self._seen_keys
+        codes = np.array([OPERATORS.index(op) for op in self.operators])  # keys use OPERATORS indices
+        parts, have = [], 0
+        for _ in range(100):
+            need = n - have
+            batch = generate_batch(need + need // 16 + 64, difficulty, self.operators, self.np_rng)
+            keys = _question_key(batch["num1"], codes[batch["op"]], batch["num2"])
+            # One sort: drop repeats within the batch and keys already seen
+            order = np.argsort(keys)
+            sorted_keys = keys[order]
+            first = np.ones(len(keys), dtype=bool)
+            first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+            if len(seen):
+                index = np.minimum(np.searchsorted(seen, sorted_keys), len(seen) - 1)
+                first &= seen[index] != sorted_keys
+            # Back to the batch's own (random) order, keeping the first need
+            take = np.sort(order[first])[:need]
+            parts.append({name: column[take] for name, column in batch.items()})
+            seen = _merge_sorted(seen, np.sort(keys[take]))
+            have += len(take)
+            if have == n:
+                break
+        else:
+            raise RuntimeError("Not enough unused questions left for this difficulty")
+        self._seen_keys = seen
+        return {name: np.concatenate([p[name] for p in parts]) for name in batch}
+
+
+def _merge_sorted(a, b):
+    """Sorted union of two sorted arrays with no keys in common."""
+    # Two sorted runs: the stable sort (timsort for int64) just merges them
+    return np.sort(np.concatenate([a, b]), kind="stable")
+
+
+def _question_key(num1, op_index, num2):
+    """One integer per question (works on ints and int64 arrays alike).
+
+    Operands stay below 2**29 even for advanced division (9999 * 9999).
+    """
+    return (op_index << 58) | (num1 << 29) | num2
+
+
+# ==========================
+# QUIZ SESSION (state machine)
+# ==========================
+# Outcomes of QuizSession.answer / QuizSession.timeout
+CORRECT = "correct"
+RETRY = "retry"  # first wrong answer: one more chance at the same question
+WRONG = "wrong"
+TIMEOUT = "timeout"
+
+SECONDS_PER_QUESTION = 15
+FEEDBACK_DELAY = 1.2  # seconds between an answer and the next question
+
+
+class QuizSession:
+    """One player's round: questions, second chances and score.
+
+    This is the flow the Tk quiz runs (start_quiz -> next_question ->
+    check_answer / timeout -> show_final_score), minus the widgets, so it
+    can also be driven by simulations and servers.
+
+    With difficulty ADAPTIVE, model (see adaptive_difficulty.py) picks each
+    question's range and learns from every answered question.
+    """
+
+    def __init__(self, max_questions=MAX_QUESTIONS, seed=None, operators=DEFAULT_OPERATORS, model=None):
+        self.max_questions = max_questions
+        self.bank = QuestionBank(seed, operators)
+        self.model = model
+        self.start(1)
+
+    def start(self, difficulty):
+        self.difficulty = difficulty
+        self.score = 0
+        self.question_number = 0
+        self.question = None
+        self.second_chance = True
+        self.response_time = 0.0  # seconds spent on the current question
+        self.bank.reset()
+
+    @property
+    def finished(self):
+        return self.question_number >= self.max_questions
+
+    @property
+    def level(self):
+        """The difficulty, or the adaptive model's stage (from 1) in ADAPTIVE."""
+        return self.model.stage + 1 if self.difficulty == ADAPTIVE else self.difficulty
+
+    def next_question(self):
+        """Moves on to the next question; returns None when the round is over."""
+        self.second_chance = True
+        self.response_time = 0.0
+        if self.finished:
+            self.question = None
+            return None
+        if self.difficulty == ADAPTIVE:
+            digit_range, operators = self.model.next_range()
+            self.question = self.bank.next_question_for(digit_range, operators)
+        else:
+            self.question = self.bank.next_question(self.difficulty)
+        self.question_number += 1
+        return self.question
+
+    def answer(self, value, seconds=None):
+        """Scores an answer and returns CORRECT, RETRY or WRONG.
+
+        seconds is how long the player took, if known (used by ADAPTIVE).
+        """
+        if seconds is not None:
+            self.response_time += seconds
+        if value == self.question.answer:
+            self.score += points_for(True, self.second_chance)
+            self._learn(1.0 if self.second_chance else 0.5, seconds)
+            return CORRECT
+        if self.second_chance:
+            self.second_chance = False
+            return RETRY
+        self._learn(0.0, seconds)
+        return WRONG
+
+    def timeout(self):
+        self.response_time += SECONDS_PER_QUESTION
+        self._learn(0.0, SECONDS_PER_QUESTION)
+        return TIMEOUT
+
+    def _learn(self, score, seconds):
+        if self.difficulty == ADAPTIVE:
+            self.model.update(score, self.response_time if seconds is not None else None)
+
+    def result(self):
+        """(percentage, rank, message) for the round so far."""
+        return final_result(self.score, self.max_questions)
+
+
+# ==========================
+# VECTORISED BATCHES
+# ==========================
+_OPTION_ORDERS = np.array(list(itertools.permutations(range(3))))
+
+
+def generate_batch(n, difficulty, operators=DEFAULT_OPERATORS, rng=None):
+    """Generates n questions with NumPy and returns them as column arrays.
+
+    Returns a dict of arrays: num1, num2, op (index into operators),
+    answer and options (n x 3, one of which is the answer). Duplicates
+    are possible here; QuestionBank.generate removes them.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    low, high = DIGIT_RANGES[difficulty]
+    ops = rng.integers(0, len(operators), n)
+    num1 = rng.integers(low, high + 1, n, dtype=np.int64)
+    num2 = rng.integers(low, high + 1, n, dtype=np.int64)
+
+    # Compare small integer codes rather than operator strings
+    codes = np.array([OPERATORS.index(op) for op in operators])[ops]
+    is_div = codes == 3
+    if is_div.any():
+        num2[is_div] = np.maximum(num2[is_div], 1)
+        num1[is_div] *= num2[is_div]  # whole-number quotient = original num1
+
+    answer = np.select(
+        [codes == 0, codes == 1, codes == 2],
+        [num1 + num2, num1 - num2, num1 * num2],
+        default=num1 // np.maximum(num2, 1),
+    )
+
+    # Two different offsets per row: pick i, then j from the remaining 9
+    offsets = np.array(DISTRACTOR_OFFSETS, dtype=np.int64)
+    i = rng.integers(0, len(offsets), n)
+    j = rng.integers(0, len(offsets) - 1, n)
+    j += j >= i
+    options = np.stack([answer, answer + offsets[i], answer + offsets[j]], axis=1)
+    # Shuffle each row's options independently (one of the 6 orders per row)
+    order = _OPTION_ORDERS[rng.integers(0, len(_OPTION_ORDERS), n)]
+    options = np.take_along_axis(options, order, axis=1)
+
+    return {"num1": num1, "num2": num2, "op": ops, "answer": answer, "options": options}
+
+
+def write_worksheet(path, batch, operators=DEFAULT_OPERATORS):
+    """Writes a generated batch to CSV: question, options and answer."""
+    symbols = np.array(operators)[batch["op"]]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["question", "option_a", "option_b", "option_c", "answer"])
+        for a, op, b, opts, answer in zip(batch["num1"].tolist(), symbols.tolist(), batch["num2"].tolist(),
+                                          batch["options"].tolist(), batch["answer"].tolist()):
+            writer.writerow([f"{a} {op} {b} =", *opts, answer])
+
+
+if __name__ == "__main__":
+    # python quiz_engine.py  - rough batch generation throughput
+    import time
+
+    rng = np.random.default_rng(0)
+    for difficulty in DIGIT_RANGES:
+        started = time.perf_counter()
+        generate_batch(1_000_000, difficulty, OPERATORS, rng)
+        elapsed = time.perf_counter() - started
+        print(f"difficulty {difficulty}: {1_000_000 / elapsed / 1e6:.1f} million questions/s")
+
+    # Unique questions: limited by the number of distinct questions in easy/moderate
+    for difficulty, n in ((2, 20_000), (3, 1_000_000)):
+        bank = QuestionBank(0, OPERATORS)
+        started = time.perf_counter()
+        bank.generate(n, difficulty)
+        elapsed = time.perf_counter() - started
+        print(f"difficulty {difficulty}, unique: {n / elapsed / 1e6:.1f} million questions/s ({n:,} questions)")
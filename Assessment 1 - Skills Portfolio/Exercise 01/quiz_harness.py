@@ -0,0 +1,137 @@
+"""Headless load harness: simulated players run through the quiz flow.
+
+Each virtual player plays one full round through quiz_engine.QuizSession,
+the same state machine the Tk quiz uses. Answer accuracy and response
+time are drawn from configurable distributions, and a response slower than
+the question timer counts as a timeout. No display is needed, so this runs
+in CI.
+
+    python quiz_harness.py --players 10000 --accuracy 0.8 --difficulty 2
+"""
+import argparse
+import json
+import math
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+import quiz_engine
+from adaptive_difficulty import AdaptiveModel
+
+
+def play_round(rng, difficulty, accuracy, rt_median, rt_sigma, seconds):
+    """Plays one round for a virtual player.
+
+    Returns (score, rank, simulated seconds, timeouts).
+    """
+    model = AdaptiveModel() if difficulty == quiz_engine.ADAPTIVE else None
+    session = quiz_engine.QuizSession(seed=rng.getrandbits(32), model=model)
+    session.start(difficulty)
+    elapsed = 0.0
+    timeouts = 0
+    while session.next_question() is not None:
+        question = session.question
+        while True:
+            # Log-normal response times: most answers quick, a long slow tail
+            response = rng.lognormvariate(math.log(rt_median), rt_sigma)
+            if response > seconds:
+                session.timeout()
+                timeouts += 1
+                elapsed += seconds + quiz_engine.FEEDBACK_DELAY
+                break
+            elapsed += response
+            if rng.random() < accuracy:
+                value = question.answer
+            else:
+                value = rng.choice([o for o in question.options if o != question.answer])
+            outcome = session.answer(value, response)
+            if outcome != quiz_engine.RETRY:
+                elapsed += quiz_engine.FEEDBACK_DELAY
+                break
+    _, rank, _ = session.result()
+    return session.score, rank, elapsed, timeouts
+
+
+def run_chunk(args):
+    """Plays a chunk of rounds in one worker process and aggregates them."""
+    seed, players, difficulty, accuracy, rt_median, rt_sigma, seconds = args
+    rng = random.Random(seed)
+    scores, ranks = Counter(), Counter()
+    total_time = 0.0
+    total_timeouts = 0
+    for _ in range(players):
+        score, rank, elapsed, timeouts = play_round(rng, difficulty, accuracy, rt_median, rt_sigma, seconds)
+        scores[score] += 1
+        ranks[rank] += 1
+        total_time += elapsed
+        total_timeouts += timeouts
+    return scores, ranks, total_time, total_timeouts
+
+
+def run(players, difficulty=1, accuracy=0.8, rt_median=4.0, rt_sigma=0.6,
+        seconds=quiz_engine.SECONDS_PER_QUESTION, workers=None, seed=0, chunk=500):
+    """Runs the simulation across a process pool and returns a report dict."""
+    chunks = []
+    for i, start in enumerate(range(0, players, chunk)):
+        chunks.append((seed * 1_000_003 + i, min(chunk, players - start), difficulty,
+                       accuracy, rt_median, rt_sigma, seconds))
+
+    started = time.perf_counter()
+    scores, ranks = Counter(), Counter()
+    total_time = 0.0
+    total_timeouts = 0
+    with Pool(workers) as pool:
+        for s, r, t, timeouts in pool.imap_unordered(run_chunk, chunks):
+            scores.update(s)
+            ranks.update(r)
+            total_time += t
+            total_timeouts += timeouts
+    wall = time.perf_counter() - started
+
+    questions = players * quiz_engine.MAX_QUESTIONS
+    mean_score = sum(score * n for score, n in scores.items()) / players
+    return {
+        "players": players,
+        "difficulty": difficulty,
+        "accuracy": accuracy,
+        "wall_seconds": round(wall, 3),
+        "players_per_second": round(players / wall, 1),
+        "questions_per_second": round(questions / wall, 1),
+        "mean_score": round(mean_score, 2),
+        "score_distribution": dict(sorted(scores.items())),
+        "rank_distribution": dict(ranks.most_common()),
+        "timeout_rate": round(total_timeouts / questions, 4),
+        "mean_round_seconds": round(total_time / players, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many players through the maths quiz.")
+    parser.add_argument("--players", type=int, default=10000)
+    parser.add_argument("--difficulty", type=int, choices=[quiz_engine.ADAPTIVE, *sorted(quiz_engine.DIGIT_RANGES)],
+                        default=1, help="1-3, or 0 for adaptive")
+    parser.add_argument("--accuracy", type=float, default=0.8, help="chance each answer is correct")
+    parser.add_argument("--rt-median", type=float, default=4.0, help="median response time in seconds")
+    parser.add_argument("--rt-sigma", type=float, default=0.6, help="log-normal spread of response times")
+    parser.add_argument("--seconds", type=int, default=quiz_engine.SECONDS_PER_QUESTION, help="question timer")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.players, args.difficulty, args.accuracy, args.rt_median, args.rt_sigma,
+                 args.seconds, args.workers, args.seed)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    print(f"{report['players']} players in {report['wall_seconds']} s "
+          f"({report['players_per_second']} players/s, {report['questions_per_second']} questions/s)")
+    print(f"mean score {report['mean_score']}, timeouts {report['timeout_rate']:.1%}, "
+          f"mean round {report['mean_round_seconds']} s")
+    print("ranks:", ", ".join(f"{rank} {n}" for rank, n in report["rank_distribution"].items()))
+    print("scores:", ", ".join(f"{score}: {n}" for score, n in report["score_distribution"].items()))
+
+
+if __name__ == "__main__":
+    main()
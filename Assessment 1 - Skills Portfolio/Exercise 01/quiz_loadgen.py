@@ -0,0 +1,146 @@
+"""Load generator for quiz_server.py: many seats playing at once.
+
+Each simulated seat keeps one keep-alive connection, plays whole rounds
+(new session, next, answer, ...) with a random think time between
+requests, and every request's round-trip latency is recorded.
+
+    python quiz_loadgen.py --seats 300 --duration 20 --spawn
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client on asyncio streams."""
+
+    def __init__(self, reader, writer, latencies):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+
+    async def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        started = time.perf_counter()
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: quiz\r\n"
+                          f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        payload = json.loads(await self.reader.readexactly(length))
+        self.latencies.append(time.perf_counter() - started)
+        return status, payload
+
+
+async def seat(host, port, stop_at, think, rng, latencies, report):
+    await asyncio.sleep(rng.uniform(0, think))  # seats don't all start in the same millisecond
+    reader, writer = await asyncio.open_connection(host, port)
+    conn = Connection(reader, writer, latencies)
+    try:
+        while time.perf_counter() < stop_at:
+            _, state = await conn.request("POST", "/sessions", {"difficulty": rng.randint(0, 3)})
+            session = state["session"]
+            while time.perf_counter() < stop_at:
+                _, state = await conn.request("POST", f"/sessions/{session}/next")
+                if state["finished"]:
+                    report["rounds"] += 1
+                    break
+                options = state["question"]["options"]
+                while state["open"]:  # the answer is hidden, so seats guess
+                    await asyncio.sleep(rng.uniform(0, think))
+                    status, state = await conn.request("POST", f"/sessions/{session}/answer", {
+                        "question": state["question_number"], "value": rng.choice(options)})
+                    if status >= 400:
+                        report["errors"] += 1
+                        break
+            await conn.request("DELETE", f"/sessions/{session}")
+    except (ConnectionError, asyncio.IncompleteReadError) as error:
+        report["errors"] += 1
+        report["last_error"] = repr(error)
+    finally:
+        writer.close()
+
+
+async def run(host, port, seats, duration, think, seed):
+    rng = random.Random(seed)
+    latencies = []
+    report = {"rounds": 0, "errors": 0}
+    stop_at = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(seat(host, port, stop_at, think, random.Random(rng.random()),
+                                latencies, report) for _ in range(seats)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    pick = lambda p: round(latencies[min(int(len(latencies) * p / 100), len(latencies) - 1)] * 1000, 3)
+    report.update({
+        "seats": seats,
+        "wall_seconds": round(wall, 2),
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / wall, 1),
+        "p50_ms": pick(50), "p90_ms": pick(90), "p99_ms": pick(99), "max_ms": pick(100),
+    })
+    return report
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a classroom of seats against quiz_server.py.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--spawn", action="store_true", help="start a server on a free port for the run")
+    parser.add_argument("--seats", type=int, default=300)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run")
+    parser.add_argument("--think", type=float, default=1.0, help="max seconds a seat waits before answering")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    parts = urlsplit(args.url)
+    host, port = parts.hostname, parts.port
+    server = None
+    if args.spawn:
+        port = free_port()
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quiz_server.py")
+        server = subprocess.Popen([sys.executable, script, "--port", str(port), "--no-results"],
+                                  stdout=subprocess.DEVNULL)
+        for _ in range(100):  # wait for it to listen
+            try:
+                socket.create_connection((host, port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+    try:
+        report = asyncio.run(run(host, port, args.seats, args.duration, args.think, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['seats']} seats, {report['requests']} requests in {report['wall_seconds']} s "
+          f"({report['requests_per_second']} req/s), {report['rounds']} rounds, {report['errors']} errors")
+    print(f"latency p50 {report['p50_ms']} ms, p90 {report['p90_ms']} ms, "
+          f"p99 {report['p99_ms']} ms, max {report['max_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Classroom server: one process hosting every seat's quiz session.
+
+A small HTTP/1.1 + JSON server on asyncio streams (keep-alive, no extra
+packages). Each session is a quiz_engine.QuizSession, so the questions
+and scoring are exactly the Tk quiz's, and each open question has its own
+timer (loop.call_at) that times it out if the seat goes quiet.
+
+    python quiz_server.py --port 8765
+    python math_quiz.py --server http://127.0.0.1:8765
+
+Endpoints (all JSON):
+    POST   /sessions                 {"difficulty": 1}  -> new session (0 = adaptive)
+    POST   /sessions/<id>/next       next question (or finished)
+    POST   /sessions/<id>/answer     {"question": n, "value": v, "seconds": s}
+    POST   /sessions/<id>/timeout    {"question": n}
+    GET    /sessions/<id>            current state
+    DELETE /sessions/<id>
+    GET    /leaderboard/<difficulty>
+    GET    /stats
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import secrets
+import time
+from http import HTTPStatus
+
+import quiz_engine
+from adaptive_difficulty import AdaptiveModel
+from quiz_client import TIME_NOT_UP
+from results_store import ResultsStore
+
+TIMER_GRACE = 0.5  # extra seconds for the client's own timeout request to arrive
+IDLE_SECONDS = 600  # sessions untouched this long are dropped
+MAX_BODY = 64 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ==========================
+# SESSIONS
+# ==========================
+class ClassroomSession:
+    """One seat: the quiz state machine plus its question timer."""
+
+    def __init__(self, session_id, difficulty, loop, on_finish):
+        self.id = session_id
+        self.quiz = quiz_engine.QuizSession(model=AdaptiveModel())  # model only used in ADAPTIVE
+        self.quiz.start(difficulty)
+        self.loop = loop
+        self.on_finish = on_finish
+        self.open = False  # an unanswered question is waiting for this seat
+        self.deadline = None
+        self.timer = None
+        self.last_outcome = None
+        self.recorded = False
+        self.last_seen = time.monotonic()
+
+    def _cancel_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def _start_timer(self):
+        self._cancel_timer()
+        self.deadline = self.loop.time() + quiz_engine.SECONDS_PER_QUESTION
+        self.timer = self.loop.call_at(self.deadline + TIMER_GRACE, self._expire)
+
+    def _expire(self):
+        self.timer = None
+        if self.open:
+            self._close(self.quiz.timeout())
+
+    def _close(self, outcome):
+        self.open = False
+        self.last_outcome = outcome
+        self._cancel_timer()
+        if self.quiz.finished and not self.recorded:
+            self.recorded = True
+            self.on_finish(self)
+
+    def next_question(self):
+        if self.open:
+            raise HTTPError(HTTPStatus.CONFLICT, "question still open")
+        if self.quiz.next_question() is None:
+            return self.state()
+        self.open = True
+        self.last_outcome = None
+        self._start_timer()
+        return self.state()
+
+    def _check_question(self, number):
+        if not self.open or number != self.quiz.question_number:
+            raise HTTPError(HTTPStatus.CONFLICT, "question already answered")
+
+    def answer(self, number, value, seconds=None):
+        self._check_question(number)
+        outcome = self.quiz.answer(value, seconds)
+        if outcome == quiz_engine.RETRY:
+            self.last_outcome = outcome
+            self._start_timer()  # a second chance gets a fresh timer, as in the Tk quiz
+        else:
+            self._close(outcome)
+        return self.state()
+
+    def timeout(self, number):
+        self._check_question(number)
+        if self.loop.time() < self.deadline - TIMER_GRACE:
+            raise HTTPError(HTTPStatus.CONFLICT, TIME_NOT_UP)
+        self._close(self.quiz.timeout())
+        return self.state()
+
+    def close(self):
+        self._cancel_timer()
+
+    def state(self):
+        quiz = self.quiz
+        question = quiz.question
+        state = {
+            "session": self.id,
+            "difficulty": quiz.difficulty,
+            "level": quiz.level,
+            "score": quiz.score,
+            "question_number": quiz.question_number,
+            "max_questions": quiz.max_questions,
+            "second_chance": quiz.second_chance,
+            "finished": quiz.finished and not self.open,
+            "open": self.open,
+            "outcome": self.last_outcome,
+            "seconds_left": round(max(self.deadline - self.loop.time(), 0), 3) if self.open else 0,
+            "question": None,
+        }
+        if question is not None:
+            state["question"] = {"num1": question.num1, "operation": question.operation,
+                                 "num2": question.num2, "options": question.options}
+            if not self.open:  # only reveal the answer once the question is closed
+                state["question"]["answer"] = question.answer
+        return state
+
+
+# ==========================
+# SERVER
+# ==========================
+class QuizServer:
+    def __init__(self, results=None):
+        self.sessions = {}
+        self.results = results
+        self.requests = 0
+        self.connections = 0
+        self.finished_rounds = 0
+        self.started = time.monotonic()
+        self._ids = itertools.count(1)
+
+    def _session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "no such session")
+        session.last_seen = time.monotonic()
+        return session
+
+    def _finished(self, session):
+        self.finished_rounds += 1
+        if self.results is not None:
+            self.results.record(session.quiz.difficulty, session.quiz.score)
+
+    def route(self, method, path, body):
+        parts = [p for p in path.split("/") if p]
+        if parts == ["sessions"] and method == "POST":
+            difficulty = body.get("difficulty", 1)
+            if difficulty != quiz_engine.ADAPTIVE and difficulty not in quiz_engine.DIGIT_RANGES:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "difficulty must be 1, 2, 3 or 0 (adaptive)")
+            session_id = f"{next(self._ids)}-{secrets.token_hex(4)}"
+            session = ClassroomSession(session_id, difficulty, asyncio.get_running_loop(), self._finished)
+            self.sessions[session_id] = session
+            return HTTPStatus.CREATED, session.state()
+        if len(parts) >= 2 and parts[0] == "sessions":
+            session = self._session(parts[1])
+            action = parts[2] if len(parts) == 3 else None
+            if method == "GET" and action is None:
+                return HTTPStatus.OK, session.state()
+            if method == "DELETE" and action is None:
+                session.close()
+                del self.sessions[session.id]
+                return HTTPStatus.OK, {"deleted": session.id}
+            if method == "POST" and action == "next":
+                return HTTPStatus.OK, session.next_question()
+            if method == "POST" and action == "answer":
+                return HTTPStatus.OK, session.answer(body.get("question"), body.get("value"), body.get("seconds"))
+            if method == "POST" and action == "timeout":
+                return HTTPStatus.OK, session.timeout(body.get("question"))
+        if len(parts) == 2 and parts[0] == "leaderboard" and method == "GET":
+            if self.results is None:
+                return HTTPStatus.OK, {"top": []}
+            return HTTPStatus.OK, {"top": self.results.leaderboard(int(parts[1]), 10)}
+        if parts == ["stats"] and method == "GET":
+            return HTTPStatus.OK, {
+                "sessions": len(self.sessions),
+                "connections": self.connections,
+                "requests": self.requests,
+                "finished_rounds": self.finished_rounds,
+                "uptime_s": round(time.monotonic() - self.started, 1),
+            }
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"no route for {method} {path}")
+
+    async def handle(self, reader, writer):
+        """Serves requests on one keep-alive connection."""
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    break
+                raw = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                try:
+                    body = json.loads(raw) if raw else {}
+                    if not isinstance(body, dict):
+                        raise ValueError("request body must be a JSON object")
+                    status, payload = self.route(method, path, body)
+                except HTTPError as error:
+                    status, payload = error.status, {"error": str(error)}
+                except (ValueError, TypeError) as error:
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": str(error)}
+
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def reap_idle(self):
+        """Drops sessions nobody has touched for IDLE_SECONDS."""
+        while True:
+            await asyncio.sleep(30)
+            cutoff = time.monotonic() - IDLE_SECONDS
+            for session_id in [s.id for s in self.sessions.values() if s.last_seen < cutoff]:
+                self.sessions.pop(session_id).close()
+
+
+async def serve(host, port, results=None):
+    server = QuizServer(results)
+    tcp = await asyncio.start_server(server.handle, host, port, backlog=1024)
+    reaper = asyncio.create_task(server.reap_idle())
+    print(f"Classroom quiz server on http://{host}:{port}")
+    try:
+        async with tcp:
+            await tcp.serve_forever()
+    finally:
+        reaper.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many maths quiz sessions from one process.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-results", action="store_true", help="don't record finished rounds")
+    args = parser.parse_args()
+
+    results = None if args.no_results else ResultsStore("classroom_results.log", "classroom_leaderboard.json")
+    try:
+        asyncio.run(serve(args.host, args.port, results))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if results is not None:
+            results.close()
+
+
+if __name__ == "__main__":
+    main()
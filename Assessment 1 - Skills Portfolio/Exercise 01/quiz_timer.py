@@ -0,0 +1,183 @@
+"""The quiz's one timer: the question countdown plus delayed transitions.
+
+Remaining time is worked out from time.monotonic() against a deadline, so
+late after() callbacks never stretch a question. The label callback only
+runs when the whole-second value actually changes, and the next tick is
+scheduled for the moment it will change.
+
+At most one transition (e.g. "next question in 1.2 s") is pending at a
+time. Scheduling another replaces it, and while one is pending the quiz
+ignores further answers, so a click landing on the timeout can't move on
+twice. Everything is written to a small event trace.
+"""
+import math
+import time
+from collections import deque
+
+
+class QuizTimer:
+    def __init__(self, page, on_tick, on_expire, clock=time.monotonic, trace_size=300):
+        self.page = page  # pages.Page (or anything with after/cancel)
+        self.on_tick = on_tick  # on_tick(seconds_left), only when it changes
+        self.on_expire = on_expire
+        self.clock = clock
+        self.deadline = None
+        self.shown = None  # last value passed to on_tick
+        self._tick_id = None
+        self._transition_id = None
+        self._transition_label = None
+        self.trace = deque(maxlen=trace_size)
+        self._started = clock()
+
+    def _log(self, event, detail=""):
+        self.trace.append((round((self.clock() - self._started) * 1000), event, detail))
+
+    # ---------- countdown ----------
+    def start(self, seconds):
+        """(Re)starts the countdown from seconds."""
+        self.stop()
+        self.deadline = self.clock() + seconds
+        self.shown = None
+        self._log("start", f"{seconds} s")
+        self._tick()
+
+    def stop(self):
+        if self._tick_id is not None:
+            self.page.cancel(self._tick_id)
+            self._tick_id = None
+        self.deadline = None
+
+    @property
+    def remaining(self):
+        if self.deadline is None:
+            return 0.0
+        return max(self.deadline - self.clock(), 0.0)
+
+    def _tick(self):
+        self._tick_id = None
+        if self.deadline is None:
+            return
+        left = self.remaining
+        seconds = math.ceil(left)
+        if seconds != self.shown:
+            self.shown = seconds
+            self.on_tick(seconds)
+        if left <= 0:
+            self.deadline = None
+            self._log("expire")
+            self.on_expire()
+            return
+        # Wake up when the displayed second next changes
+        delay_ms = math.ceil((left - (seconds - 1)) * 1000)
+        self._tick_id = self.page.after(max(delay_ms, 1), self._tick, label="countdown")
+
+    # ---------- transitions ----------
+    @property
+    def transition_pending(self):
+        return self._transition_id is not None
+
+    def transition(self, ms, func, label=None):
+        """Runs func after ms, replacing any transition still pending."""
+        label = label or func.__name__
+        self.cancel_transition()
+
+        def fire():
+            self._transition_id = None
+            self._log("fire", label)
+            func()
+
+        self._transition_id = self.page.after(ms, fire, label=label)
+        self._transition_label = label
+        self._log("schedule", f"{label} in {ms} ms")
+
+    def cancel_transition(self):
+        if self._transition_id is not None:
+            self.page.cancel(self._transition_id)
+            self._log("cancel", self._transition_label)
+            self._transition_id = None
+
+    def reset(self):
+        """Stops the countdown and drops any pending transition."""
+        self.stop()
+        self.cancel_transition()
+        self._log("reset")
+
+    def ignored(self, what):
+        """Notes an input that arrived while a transition was pending."""
+        self._log("ignored", what)
+
+    def trace_lines(self):
+        return [f"{ms:>8} ms  {event:<8} {detail}" for ms, event, detail in self.trace]
+
+
+# ==========================
+# RAPID-CLICK TRACE
+# ==========================
+if __name__ == "__main__":
+    # python quiz_timer.py  - replays clicks landing on the timeout on a fake clock
+    import heapq
+    import random
+
+    class FakePage:
+        """Page.after/cancel on a virtual clock, without Tk."""
+
+        def __init__(self):
+            self.now = 0.0
+            self.queue = []
+            self.live = set()
+            self.next_id = 0
+
+        def clock(self):
+            return self.now
+
+        def after(self, ms, func, label=None):
+            self.next_id += 1
+            heapq.heappush(self.queue, (self.now + ms / 1000, self.next_id, func))
+            self.live.add(self.next_id)
+            return self.next_id
+
+        def cancel(self, after_id):
+            self.live.discard(after_id)
+
+        def run_until(self, t):
+            while self.queue and self.queue[0][0] <= t:
+                when, after_id, func = heapq.heappop(self.queue)
+                if after_id in self.live:
+                    self.live.remove(after_id)
+                    self.now = when
+                    func()
+            self.now = t
+
+    page = FakePage()
+    questions_started = []
+
+    def next_question():
+        questions_started.append(page.now)
+        timer.start(15)
+
+    def on_expire():
+        timer.transition(1200, next_question)
+
+    def click():
+        if timer.transition_pending:
+            timer.ignored("answer")
+            return
+        timer.stop()
+        timer.transition(1200, next_question)
+
+    timer = QuizTimer(page, on_tick=lambda s: None, on_expire=on_expire, clock=page.clock)
+    next_question()
+    rng = random.Random(0)
+    for question in range(10):
+        expires = questions_started[-1] + 15
+        # A burst of clicks in the last 50 ms before and after the timeout
+        for t in sorted(expires + rng.uniform(-0.05, 0.05) for _ in range(8)):
+            page.run_until(t)
+            click()
+        page.run_until(expires + 2)
+
+    print("\n".join(timer.trace_lines()[-20:]))
+    fired = sum(1 for _, event, _ in timer.trace if event == "fire")
+    gaps = [round(b - a, 3) for a, b in zip(questions_started, questions_started[1:])]
+    print(f"\n{len(questions_started)} questions started, {fired} transitions fired, gaps {sorted(set(gaps))}")
+    assert fired == len(questions_started) - 1, "duplicate transition"
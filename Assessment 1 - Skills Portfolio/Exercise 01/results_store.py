@@ -0,0 +1,140 @@
+"""Append-only log of finished quiz rounds plus a top-K leaderboard.
+
+Every round is one fixed-size binary record (timestamp, difficulty, score,
+CRC32) appended to the log. Records are buffered in memory and written and
+fsynced in batches; after each sync the per-difficulty top-K heaps are
+saved to a small snapshot file, so opening the leaderboard only reads K
+entries per level instead of the whole history.
+
+A torn record at the end of the log (crash mid-write) fails its CRC and is
+cut off on the next open.
+"""
+import heapq
+import json
+import os
+import struct
+import time
+import zlib
+
+RECORD = struct.Struct("<dBH")  # timestamp, difficulty, score
+RECORD_SIZE = RECORD.size + 4  # + CRC32
+
+
+def _pack(timestamp, difficulty, score):
+    body = RECORD.pack(timestamp, difficulty, score)
+    return body + struct.pack("<I", zlib.crc32(body))
+
+
+class ResultsStore:
+    def __init__(self, log_path="quiz_results.log", snapshot_path="quiz_leaderboard.json",
+                 k=10, batch_size=256, sync_interval=2.0):
+        self.log_path = log_path
+        self.snapshot_path = snapshot_path
+        self.k = k
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        self.top = {}  # difficulty -> min-heap of (score, timestamp), at most k long
+        self.rounds = 0
+        self._buffer = []
+        self._last_sync = 0.0
+
+        durable_size = self._repair_log()
+        covered = self._load_snapshot(durable_size)
+        if covered < durable_size:
+            self._scan_log(covered)  # only records the snapshot has not seen
+        self._file = open(self.log_path, "ab")
+
+    # ---------- loading ----------
+    def _repair_log(self):
+        """Cuts off a partial or corrupt record at the end of the log."""
+        if not os.path.exists(self.log_path):
+            return 0
+        size = os.path.getsize(self.log_path)
+        good = size - size % RECORD_SIZE
+        if good:
+            with open(self.log_path, "rb") as f:
+                f.seek(good - RECORD_SIZE)
+                record = f.read(RECORD_SIZE)
+            if struct.unpack("<I", record[-4:])[0] != zlib.crc32(record[:-4]):
+                good -= RECORD_SIZE
+        if good != size:
+            with open(self.log_path, "r+b") as f:
+                f.truncate(good)
+        return good
+
+    def _load_snapshot(self, durable_size):
+        """Loads the saved top-K heaps; returns how many log bytes they cover."""
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if snapshot.get("k") != self.k or snapshot.get("log_size", 0) > durable_size:
+            return 0  # different K, or the log lost records: rebuild from the log
+        self.top = {int(level): [tuple(entry) for entry in entries]
+                    for level, entries in snapshot["top"].items()}
+        for heap in self.top.values():
+            heapq.heapify(heap)
+        self.rounds = snapshot["log_size"] // RECORD_SIZE
+        return snapshot["log_size"]
+
+    def _scan_log(self, offset):
+        if offset == 0:
+            self.top, self.rounds = {}, 0
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            while True:
+                record = f.read(RECORD_SIZE)
+                if len(record) < RECORD_SIZE:
+                    break
+                if struct.unpack("<I", record[-4:])[0] != zlib.crc32(record[:-4]):
+                    continue  # skip a damaged record
+                timestamp, difficulty, score = RECORD.unpack(record[:-4])
+                self._add_to_top(difficulty, score, timestamp)
+                self.rounds += 1
+
+    # ---------- writing ----------
+    def _add_to_top(self, difficulty, score, timestamp):
+        heap = self.top.setdefault(difficulty, [])
+        entry = (score, timestamp)
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def record(self, difficulty, score, timestamp=None):
+        """Adds a finished round; syncs to disk in batches."""
+        timestamp = time.time() if timestamp is None else timestamp
+        self._buffer.append(_pack(timestamp, difficulty, score))
+        self._add_to_top(difficulty, score, timestamp)
+        self.rounds += 1
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.flush()
+
+    def flush(self):
+        """Writes buffered rounds, fsyncs the log, then saves the snapshot."""
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self._buffer = []
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._save_snapshot(self._file.tell())
+        self._last_sync = time.monotonic()
+
+    def _save_snapshot(self, log_size):
+        snapshot = {"k": self.k, "log_size": log_size,
+                    "top": {str(level): heap for level, heap in self.top.items()}}
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, self.snapshot_path)
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    # ---------- reading ----------
+    def leaderboard(self, difficulty, limit=None):
+        """Best (score, timestamp) pairs for a difficulty, highest first."""
+        best = sorted(self.top.get(difficulty, []), reverse=True)
+        return best[:limit] if limit else best
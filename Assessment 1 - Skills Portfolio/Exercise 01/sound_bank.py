@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from collections import deque
+
+import pygame
+
+LATENCY_HISTORY = 1000  # per-call times kept per operation
+
+# ==========================
+# SOUND BANK
+# ==========================
+class SoundBank:
+    """Decodes every sound once and plays it on its own reserved channel.
+
+    Effects and music tracks are decoded into pygame Sounds on a background
+    thread. Until a sound has finished loading it falls back to the old
+    behaviour (decode on the spot / stream music with pygame.mixer.music),
+    so nothing is ever missing, just slower the very first time.
+    """
+
+    def __init__(self, effects, music):
+        self.effect_paths = [p for p in effects if os.path.exists(p)]
+        self.music_paths = [p for p in music if os.path.exists(p)]
+        self.sounds = {}  # path -> decoded pygame Sound
+        self._lock = threading.Lock()
+
+        # One reserved channel per effect, plus one for music
+        pygame.mixer.set_reserved(len(self.effect_paths) + 1)
+        self.channels = {path: pygame.mixer.Channel(i) for i, path in enumerate(self.effect_paths)}
+        self.music_channel = pygame.mixer.Channel(len(self.effect_paths))
+        self.current_music = None
+
+        self.latency = {}  # operation -> the last LATENCY_HISTORY per-call times in ms
+        self.calls = {}  # operation -> calls ever made
+
+    def load(self, background=True):
+        """Decodes all sounds, on a daemon thread unless background=False."""
+        if background:
+            threading.Thread(target=self._load_all, name="sound-bank", daemon=True).start()
+        else:
+            self._load_all()
+
+    def _load_all(self):
+        for path in self.effect_paths + self.music_paths:
+            sound = pygame.mixer.Sound(path)
+            with self._lock:
+                self.sounds[path] = sound
+
+    def _get(self, path):
+        with self._lock:
+            return self.sounds.get(path)
+
+    def _record(self, operation, started):
+        self.latency.setdefault(operation, deque(maxlen=LATENCY_HISTORY)).append((time.perf_counter() - started) * 1000)
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+
+    def play(self, path, volume=1.0):
+        """Plays a short effect."""
+        started = time.perf_counter()
+        sound = self._get(path)
+        if sound is None:
+            if not os.path.exists(path):
+                return
+            sound = pygame.mixer.Sound(path)  # not loaded yet: decode now
+        sound.set_volume(volume)
+        channel = self.channels.get(path)
+        if channel is not None:
+            channel.play(sound)
+        else:
+            sound.play()
+        self._record("effect", started)
+
+    def play_music(self, path, loop=-1, volume=0.5):
+        """Starts a looping music track, replacing whatever was playing."""
+        started = time.perf_counter()
+        if not os.path.exists(path):
+            return
+        self.stop_music()
+        sound = self._get(path)
+        if sound is not None:
+            sound.set_volume(volume)
+            self.music_channel.play(sound, loops=loop)
+        else:
+            pygame.mixer.music.load(path)  # not decoded yet: stream it
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(loop)
+        self.current_music = path
+        self._record("music", started)
+
+    def stop_music(self):
+        self.music_channel.stop()
+        pygame.mixer.music.stop()
+        self.current_music = None
+
+    def stats(self):
+        """Mean and max latency in ms over the recent calls, for effects and music."""
+        return {
+            op: {"calls": self.calls[op], "mean_ms": round(sum(times) / len(times), 3), "max_ms": round(max(times), 3)}
+            for op, times in self.latency.items() if times
+        }
+
+
+# ==========================
+# LATENCY COMPARISON
+# ==========================
+if __name__ == "__main__":
+    # python sound_bank.py  - compares the old decode-per-call path with the bank
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    pygame.mixer.init()
+    effects = ["correct.mp3", "wrong.mp3"]
+
+    timings = []
+    for i in range(20):
+        started = time.perf_counter()
+        sound = pygame.mixer.Sound(effects[i % 2])  # what play_sound used to do
+        sound.set_volume(1.0)
+        sound.play()
+        timings.append((time.perf_counter() - started) * 1000)
+    pygame.mixer.stop()
+    print(f"old play_sound: mean {sum(timings) / len(timings):.3f} ms, max {max(timings):.3f} ms")
+
+    bank = SoundBank(effects, [])
+    bank.load(background=False)
+    for i in range(20):
+        bank.play(effects[i % 2])
+    stats = bank.stats()["effect"]
+    print(f"SoundBank.play: mean {stats['mean_ms']:.3f} ms, max {stats['max_ms']:.3f} ms")
@@ -0,0 +1,184 @@
+"""Opt-in latency histograms for Tk callbacks.
+
+install() patches tkinter so every Python callback Tk runs (after() and
+after_idle() callbacks, event bindings, button commands) is timed, and
+after() callbacks also record how late they started. A small probe
+measures overall event-loop lag. Times go into HDR-style log-linear
+histograms and are written to JSON by dump().
+
+math_quiz.py only imports this when QUIZ_TK_PROFILE is set, so with
+profiling off tkinter is left untouched and nothing extra runs.
+"""
+import atexit
+import json
+import time
+import tkinter as tk
+
+# ==========================
+# HISTOGRAM
+# ==========================
+class Histogram:
+    """Log-linear histogram of microsecond values (HDR-style).
+
+    Values below 2**sub_bits are counted exactly; above that each power of
+    two is split into 2**sub_bits buckets, so any value is stored to
+    within 1 / 2**sub_bits of itself (under 1% for the default 7 bits).
+    """
+
+    def __init__(self, sub_bits=7):
+        self.sub_bits = sub_bits
+        self.sub_count = 1 << sub_bits
+        self.counts = {}  # bucket index -> count
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value):
+        if value < self.sub_count:
+            return value
+        shift = value.bit_length() - 1 - self.sub_bits
+        return (shift + 1) * self.sub_count + (value >> shift) - self.sub_count
+
+    def _bounds(self, index):
+        """(lowest, highest) value stored in bucket index."""
+        if index < self.sub_count:
+            return index, index
+        shift = index // self.sub_count - 1
+        low = (index % self.sub_count + self.sub_count) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, value_us):
+        value = max(int(value_us), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def percentile(self, p):
+        """Value (us) at or below which p percent of the records fall."""
+        if not self.count:
+            return 0
+        target = max(1, round(self.count * p / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._bounds(index)[1], self.max)
+        return self.max
+
+    def to_dict(self):
+        ms = lambda us: round(us / 1000, 3)
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total / self.count) if self.count else 0,
+            "min_ms": ms(self.min or 0),
+            "p50_ms": ms(self.percentile(50)),
+            "p90_ms": ms(self.percentile(90)),
+            "p99_ms": ms(self.percentile(99)),
+            "p999_ms": ms(self.percentile(99.9)),
+            "max_ms": ms(self.max),
+            # Non-empty buckets as [lowest value in us, count]
+            "buckets": [[self._bounds(i)[0], self.counts[i]] for i in sorted(self.counts)],
+        }
+
+
+# ==========================
+# INSTRUMENTATION
+# ==========================
+histograms = {}  # label -> Histogram
+output_path = None
+_installed = False
+_scheduling_after = None  # (due time, kind) while Misc.after is registering its callback
+_original_after = tk.Misc.after
+_original_register = tk.Misc._register
+
+
+def _histogram(label):
+    hist = histograms.get(label)
+    if hist is None:
+        hist = histograms[label] = Histogram()
+    return hist
+
+
+def _callback_name(func):
+    func = getattr(func, "__func__", func)
+    return getattr(func, "__name__", type(func).__name__)
+
+
+def _timed_after(self, ms, func=None, *args):
+    global _scheduling_after
+    if func is None:
+        return _original_after(self, ms)
+    delay = 0 if ms == "idle" else ms / 1000
+    _scheduling_after = (time.perf_counter() + delay, "idle" if ms == "idle" else "after")
+    try:
+        return _original_after(self, ms, func, *args)
+    finally:
+        _scheduling_after = None
+
+
+def _timed_register(self, func, subst=None, needcleanup=1):
+    # after() wraps its callback in a function named after it, so the name
+    # is the scheduled function's even for after callbacks
+    name = _callback_name(func)
+    if _scheduling_after is not None:
+        due, kind = _scheduling_after
+        run_hist = _histogram(f"{kind}:{name}")
+        lag_hist = _histogram(f"{kind}_lag:{name}")
+    else:
+        due = None
+        run_hist = _histogram(f"handler:{name}")
+
+    def timed(*args):
+        started = time.perf_counter()
+        if due is not None:
+            lag_hist.record((started - due) * 1e6)
+        try:
+            return func(*args)
+        finally:
+            run_hist.record((time.perf_counter() - started) * 1e6)
+
+    timed.__name__ = name
+    return _original_register(self, timed, subst, needcleanup)
+
+
+def _probe_loop_lag(root, interval_ms):
+    """Schedules itself every interval_ms and records how late it runs."""
+    hist = _histogram("loop_lag")
+    expected = [time.perf_counter() + interval_ms / 1000]
+
+    def probe():
+        now = time.perf_counter()
+        hist.record((now - expected[0]) * 1e6)
+        expected[0] = now + interval_ms / 1000
+        root.tk.call("after", interval_ms, command)
+
+    # One untimed Tcl command, rescheduled directly instead of via after()
+    command = _original_register(root, probe, needcleanup=0)
+    root.tk.call("after", interval_ms, command)
+
+
+def install(root, path, probe_ms=50):
+    """Starts timing every Tk callback; dump() writes the results to path."""
+    global output_path, _installed
+    output_path = path
+    if not _installed:
+        tk.Misc.after = _timed_after
+        tk.Misc._register = _timed_register
+        atexit.register(dump)
+        _installed = True
+    _probe_loop_lag(root, probe_ms)
+
+
+def dump(event=None):
+    """Writes every histogram, slowest p99 first, to the output JSON file."""
+    if not output_path:
+        return
+    report = {label: hist.to_dict() for label, hist in histograms.items()}
+    report = dict(sorted(report.items(), key=lambda item: item[1]["p99_ms"], reverse=True))
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"Tk callback timings written to {output_path}")
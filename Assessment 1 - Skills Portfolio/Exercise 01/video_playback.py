@@ -0,0 +1,436 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+# Open/rewind/first-frame latencies go here; math_quiz routes it to a file
+timing_log = logging.getLogger("math_quiz.timing")
+
+# ==========================
+# DECODED FRAME CACHE
+# ==========================
+class FrameCache:
+    """Keeps fully decoded clips in memory, evicting least recently used.
+
+    Each clip is stored as one contiguous uint8 array of shape
+    (frames, height, width, 3) already scaled to screen resolution, so a
+    looping clip only has to be decoded once.
+    That is raw RGB, about 6 MB per 1080p frame, so the budget must cover
+    frames x 6 MB for every clip meant to stay cached.
+    """
+
+    def __init__(self, budget_mb=1024):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._clips = OrderedDict()  # key -> (frames, fps)
+        self._lock = threading.Lock()
+
+    def used_bytes(self):
+        with self._lock:
+            return sum(frames.nbytes for frames, _ in self._clips.values())
+
+    def fits(self, nbytes):
+        """True if a clip of nbytes could ever be held within the budget."""
+        return 0 < nbytes <= self.budget_bytes
+
+    def get(self, key):
+        """Returns (frames, fps) for a cached clip, or None."""
+        with self._lock:
+            entry = self._clips.get(key)
+            if entry is not None:
+                self._clips.move_to_end(key)
+            return entry
+
+    def put(self, key, frames, fps):
+        """Stores a decoded clip, evicting older clips to stay in budget."""
+        if not self.fits(frames.nbytes):
+            return False
+        with self._lock:
+            self._clips.pop(key, None)
+            used = sum(f.nbytes for f, _ in self._clips.values())
+            while self._clips and used + frames.nbytes > self.budget_bytes:
+                _, (evicted, _) = self._clips.popitem(last=False)
+                used -= evicted.nbytes
+            self._clips[key] = (frames, fps)
+        return True
+
+
+# ==========================
+# FRAME DEADLINE CLOCK
+# ==========================
+class FrameClock:
+    """Schedules frames against a monotonic clock at the clip's frame rate.
+
+    tick() is called once per frame. It returns how long to wait until the
+    next frame is due and how many whole frames we are behind (those should
+    be skipped rather than shown late). Lateness is recorded for stats().
+    """
+
+    def __init__(self, fps=30.0):
+        self.set_fps(fps)
+        self.reset()
+
+    def set_fps(self, fps):
+        self.interval = 1.0 / fps if fps and fps > 0 else 0.03
+
+    def reset(self):
+        self.next_due = None
+        self.ticks = 0
+        self.late_ticks = 0  # ticks that were at least one whole frame late
+        self.skipped = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+
+    def tick(self):
+        now = time.monotonic()
+        if self.next_due is None:
+            self.next_due = now
+        lateness = now - self.next_due
+        behind = 0
+        self.ticks += 1
+        if lateness > 0:
+            self.total_lateness += lateness
+            self.max_lateness = max(self.max_lateness, lateness)
+            behind = int(lateness / self.interval)
+            if behind:
+                self.late_ticks += 1
+                self.skipped += behind
+        # Skip the frames we missed and aim for the next one still in the future
+        self.next_due += (behind + 1) * self.interval
+        return max(self.next_due - now, 0.0), behind
+
+    def stats(self):
+        return {
+            "fps": round(1.0 / self.interval, 2),
+            "mean_late_ms": round(self.total_lateness / max(self.ticks, 1) * 1000, 2),
+            "max_late_ms": round(self.max_lateness * 1000, 2),
+            "late_ticks": self.late_ticks,
+            "skipped_frames": self.skipped,
+        }
+
+
+# ==========================
+# BACKGROUND FRAME DECODER
+# ==========================
+class FrameDecoder:
+    """Decodes, scales and converts video frames on a worker thread.
+
+    The worker keeps a small ring buffer of ready RGB frames. The Tk side
+    only calls latest_frame(), which hands back the newest frame and drops
+    any older ones that were never shown.
+
+    If a FrameCache is given, the first full loop is decoded into one
+    contiguous array and later loops replay straight from memory.
+    """
+
+    def __init__(self, path, size, buffer_size=3, cache=None):
+        self.path = path
+        self.size = size  # (width, height) of the decoded frames
+        self.cache = cache
+        self.cache_key = (path, size)
+        self.cap = None  # opened lazily, only if the clip is not cached
+        self.clock = FrameClock()  # paces the worker at the clip's fps
+        self.display_clock = FrameClock()  # paces the Tk-side blits
+        self._skip = 0  # frames the worker should skip to catch up
+
+        # Ring buffer of ready frames. Decoded frames are written into a fixed
+        # set of preallocated slots: up to buffer_size ready, one on screen
+        # and one being written by the worker.
+        self.buffer_size = buffer_size
+        self._ready = deque()
+        width, height = size
+        self._slots = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(buffer_size + 2)]
+        self._slot_ids = {id(slot) for slot in self._slots}
+        self._free = deque(self._slots)
+        self._showing = None  # slot currently handed to the Tk side
+        self._scaled = np.empty((height, width, 3), dtype=np.uint8)  # cv2.resize dst
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+        self._running = False
+        self.failed = False  # set once the clip opened but gave no frames at all
+
+        # Counters used by stats()
+        self.decoded_frames = 0
+        self.shown_frames = 0
+        self.dropped_frames = 0
+        self.cached_frames = 0
+        self._stats_started = time.monotonic()
+
+    def start(self):
+        """Starts the worker thread (does nothing if running or failed)."""
+        if self._running or self.failed:
+            return
+        self._running = True
+        while self._ready:
+            self._recycle(self._ready.popleft())  # drop frames left from the last run
+        self.decoded_frames = self.shown_frames = self.dropped_frames = self.cached_frames = 0
+        self.clock.reset()
+        self.display_clock.reset()
+        self._stats_started = time.monotonic()
+        self._first_frame_pending = True
+        self._thread = threading.Thread(target=self._run, name=f"decoder:{self.path}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the worker thread and waits for it to finish."""
+        with self._lock:
+            self._running = False
+            self._wake.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def release(self):
+        """Stops the worker and releases the underlying capture."""
+        self.stop()
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def _open(self):
+        if self.cap is None:
+            started = time.perf_counter()
+            self.cap = cv2.VideoCapture(self.path)
+            timing_log.info("open %s: %.1f ms", self.path, (time.perf_counter() - started) * 1000)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        return fps if fps and fps > 0 else 1.0 / 0.03
+
+    def _decode_next(self, dst=None):
+        """Decodes the next frame into dst (a free slot if not given).
+
+        Returns None at the end of the clip.
+        """
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        if dst is None:
+            dst = self._take_slot()
+        if frame.shape[1::-1] != self.size:  # prepared clips are already screen-sized
+            frame = cv2.resize(frame, self.size, dst=self._scaled)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=dst)
+
+    def _take_slot(self):
+        """Returns a free slot, recycling the oldest unshown frame if needed."""
+        with self._lock:
+            if self._free:
+                return self._free.popleft()
+            if self._ready:
+                self.dropped_frames += 1
+                return self._ready.popleft()
+        # Every slot is in use (should not happen): a one-off array, never recycled
+        width, height = self.size
+        return np.empty((height, width, 3), dtype=np.uint8)
+
+    def _recycle(self, frame):
+        """Returns a slot to the free list (cached frames are not slots)."""
+        if frame is not None and id(frame) in self._slot_ids:
+            self._free.append(frame)
+
+    def _take_skip(self):
+        with self._lock:
+            skip, self._skip = self._skip, 0
+            return skip
+
+    def _grab_skipped(self):
+        """Advances past late frames with grab(), which skips the full decode."""
+        for _ in range(self._take_skip()):
+            if not self.cap.grab():
+                break
+
+    def _frames(self):
+        """Yields frames forever, from the cache when possible."""
+        entry = self.cache.get(self.cache_key) if self.cache is not None else None
+        if entry is None:
+            fps = self._open()
+            self.clock.set_fps(fps)
+            yield from self._decode_first_loop(fps)
+            entry = self.cache.get(self.cache_key) if self.cache is not None else None
+        if entry is not None:
+            # Replay from memory: no decoding at all
+            frames, fps = entry
+            self.clock.set_fps(fps)
+            index = 0
+            while True:
+                index = (index + self._take_skip()) % len(frames)
+                self.cached_frames += 1
+                yield frames[index]
+                index += 1
+        while True:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            frame = self._decode_next()
+            if frame is None:
+                return
+            while frame is not None:
+                yield frame
+                self._grab_skipped()
+                frame = self._decode_next()
+
+    def _decode_first_loop(self, fps):
+        """Decodes one loop, filling the cache array if it fits the budget.
+
+        Every frame of this loop is decoded (no skipping), since all of them
+        are needed for the cache.
+        """
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        store = None
+        if self.cache is not None:
+            count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            width, height = self.size
+            if self.cache.fits(count * height * width * 3):
+                store = np.empty((count, height, width, 3), dtype=np.uint8)
+        index = 0
+        while True:
+            dst = store[index] if store is not None and index < len(store) else None
+            frame = self._decode_next(dst)
+            if frame is None:
+                break
+            if dst is None:
+                store = None  # frame count was underestimated; give up caching
+            index += 1
+            yield frame
+        if store is not None and index > 0:
+            # Frame count was overestimated: copy so the unused tail is freed
+            self.cache.put(self.cache_key, store if index == len(store) else store[:index].copy(), fps)
+
+    def _run(self):
+        produced = False
+        for frame in self._frames():
+            produced = True
+            with self._lock:
+                if not self._running:
+                    self._recycle(frame)  # decoded after stop(): give its slot back
+                    return
+                if len(self._ready) >= self.buffer_size:
+                    self.dropped_frames += 1  # oldest frame falls off the ring
+                    self._recycle(self._ready.popleft())
+                self._ready.append(frame)
+                self.decoded_frames += 1
+                if self._first_frame_pending:
+                    self._first_frame_pending = False
+                    timing_log.info("first frame %s: %.1f ms after start",
+                                    self.path, (time.monotonic() - self._stats_started) * 1000)
+                # Produce frames on the clip's own clock, skipping when behind
+                delay, self._skip = self.clock.tick()
+                if delay > 0:
+                    self._wake.wait(delay)
+        with self._lock:
+            self._running = False  # capture closed or unreadable
+            if not produced:
+                self.failed = True  # restarting would only fail again
+        if not produced:
+            print(f"Warning: Video file '{self.path}' has no readable frames.")
+
+    def latest_frame(self):
+        """Returns the newest decoded frame (or None) and drops stale ones.
+
+        The returned array stays valid until the next call, so it must be
+        blitted straight away (FramePresenter.show copies it into Tk).
+        """
+        with self._lock:
+            if not self._ready:
+                return None
+            self._recycle(self._showing)
+            frame = self._ready.pop()
+            self.dropped_frames += len(self._ready)
+            while self._ready:
+                self._recycle(self._ready.popleft())
+            self._showing = frame
+            self.shown_frames += 1
+            return frame
+
+    def next_display_delay_ms(self):
+        """Milliseconds until the Tk side should blit the next frame."""
+        self.display_clock.interval = self.clock.interval
+        delay, _ = self.display_clock.tick()
+        return max(1, int(delay * 1000))
+
+    def stats(self):
+        """Returns measured rates, dropped frames and lateness per clip."""
+        elapsed = max(time.monotonic() - self._stats_started, 1e-6)
+        return {
+            "clip": self.path,
+            "decode_fps": round(self.decoded_frames / elapsed, 1),
+            "shown_fps": round(self.shown_frames / elapsed, 1),
+            "dropped_frames": self.dropped_frames,
+            "from_cache": self.cached_frames,
+            "cache_mb": round(self.cache.used_bytes() / 2**20) if self.cache is not None else 0,
+            "decode_timing": self.clock.stats(),
+            "display_timing": self.display_clock.stats(),
+        }
+
+
+# ==========================
+# CAPTURE POOL
+# ==========================
+class CapturePool:
+    """Keeps one FrameDecoder per clip for the life of the app.
+
+    Clips are only opened when first requested (i.e. when their page is
+    first shown). Reusing a clip just restarts its worker, which seeks
+    back to frame 0, instead of re-opening the file. A clip that opened
+    but gave no frames is treated like a missing one.
+    """
+
+    def __init__(self, size, cache=None, prefer=None):
+        self.size = size
+        self.cache = cache
+        self.prefer = prefer  # prefer(path) -> a prepared copy of the clip, or None
+        self.decoders = {}  # path -> FrameDecoder (or None if missing)
+
+    def get(self, path):
+        if path not in self.decoders:
+            if os.path.exists(path):
+                source = (self.prefer and self.prefer(path)) or path
+                self.decoders[path] = FrameDecoder(source, self.size, cache=self.cache)
+            else:
+                print(f"Warning: Video file '{path}' not found.")
+                self.decoders[path] = None
+        decoder = self.decoders[path]
+        return None if decoder is None or decoder.failed else decoder
+
+    def release_all(self):
+        for decoder in self.decoders.values():
+            if decoder is not None:
+                decoder.release()
+        self.decoders = {}
+
+
+# ==========================
+# FRAME PRESENTER
+# ==========================
+class FramePresenter:
+    """Blits RGB frames onto one canvas image item without reallocating.
+
+    A single PIL image and PhotoImage are created up front; each frame is
+    unpacked into the PIL image's existing buffer and pasted into the same
+    PhotoImage, so the canvas item never has to be reconfigured.
+    """
+
+    def __init__(self, canvas_widget, item_id, size):
+        self.image = Image.new("RGB", size)
+        self.photo = ImageTk.PhotoImage(self.image)
+        canvas_widget.itemconfig(item_id, image=self.photo)
+
+    def show(self, frame):
+        self.image.frombytes(frame)  # frame must be a C-contiguous uint8 array
+        self.photo.paste(self.image)
+
+
+if __name__ == "__main__":
+    # python video_playback.py  - a pooled decoder restarted like a page shown and hidden over and over
+    pool = CapturePool((640, 360))
+    decoder = pool.get(os.path.join(os.path.dirname(os.path.abspath(__file__)), "quiz2.mp4"))
+    for run in range(10):
+        decoder.start()
+        time.sleep(0.3)
+        shown = decoder.latest_frame() is not None
+        decoder.stop()
+        slots = len(decoder._free) + len(decoder._ready) + (decoder._showing is not None)
+        print(f"run {run + 1}: frame shown {shown}, slots accounted for {slots}/{len(decoder._slots)}")
+        assert shown and slots == len(decoder._slots), "decoder lost a ring slot"
+    pool.release_all()
@@ -5,42 +5,19 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 import random
 import os
-
-try:
-    from tkvideo import tkvideo
-except ImportError:
-    messagebox.showerror("Error", "Please install tkvideo:\n pip install tkvideo")
-    exit()
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Shared helpers
+from asset_cache import CACHE_DIR, prepared_video_path  # Screen-sized copies from prepare_assets.py
+from joke_corpus import JokeCorpus  # Jokes read on demand from randomJokes.txt
+from joke_sampler import JokeSampler  # Random order per level, no repeats, kept between runs
+from typewriter import Typewriter  # One time-based typing animation per label
+from confetti import ConfettiLayer  # NumPy particles drawn into one canvas image
+from animation_clock import AnimationClock, blend, ease_out  # One tick for every overlay animation
+from video_player import VideoPlayer  # Background video that lowers its quality when the app is busy
+from joke_speech import JokeSpeaker  # Offline text-to-speech, rendered ahead into a cache
 
 import pygame  # For background music and punchline sound
 
-# ==========================
-# JOKES DATA
-# ==========================
-jokes = {
-    "easy": [
-        ("Why did the chicken cross the road? 🐔", "To get to the other side! 🚶‍♂️"),
-        ("What do you call a bear with no teeth? 🐻", "A gummy bear! 🍬"),
-        ("Why did the banana go to the doctor? 🍌", "Because it wasn’t peeling well! 😷"),
-        ("Why did the car get a flat tire? 🚗", "Because there was a fork in the road! 🍴"),
-        ("How did the hipster burn his mouth? 😎", "He ate his pizza before it was cool! 🍕🔥")
-    ],
-    "medium": [
-        ("Why did the math book look sad? 📚", "Because it had too many problems! ➗"),
-        ("What do you call fake spaghetti? 🍝", "An impasta! 😆"),
-        ("Why can't your nose be 12 inches long? 👃", "Because then it would be a foot! 🦶"),
-        ("Why does the golfer wear two pants? ⛳", "Because he's afraid he might get a 'Hole-in-one.' 🏌️"),
-        ("Why should you wear glasses to maths class? 🤓", "Because it helps with division! ➗")
-    ],
-    "hard": [
-        ("Why do programmers prefer dark mode? 💻", "Because light attracts bugs! 🐛"),
-        ("Why did the scarecrow win an award? 🌾", "Because he was outstanding in his field! 🏆"),
-        ("Why did the coffee file a police report? ☕", "It got mugged! 😱"),
-        ("Why did the developer go broke? 💰", "Because he used up all his cache. 💾"),
-        ("What do you call a dinosaur with only one eye? 🦖", "A Do-you-think-he-saw-us! 👀")
-    ]
-}
-
 # ==========================
 # MAIN JOKE APP
 # ==========================
@@ -48,16 +25,28 @@ class JokeApp:
     def __init__(self, root):
         self.root = root
         self.root.attributes("-fullscreen", True)
+        # Screen size is asked for once; the animations use these
+        self.screen_width = screen_width = root.winfo_screenwidth()
+        self.screen_height = screen_height = root.winfo_screenheight()
+        self.clock = AnimationClock(root)
+        self.level_up = None  # canvas of the level-up overlay on screen
+        self.root.bind("<F5>", lambda e: print(self.clock.report()))
+        self.root.bind("<F6>", self.toggle_video_stats)
 
         # Background video
         script_dir = os.path.dirname(os.path.abspath(__file__))
         bg_video_path = os.path.join(script_dir, "jokepage.mp4")
         self.video_label = tk.Label(root)
         self.video_label.place(x=0, y=0, relwidth=1, relheight=1)
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
-        self.bg_video = tkvideo(bg_video_path, self.video_label, loop=0, size=(screen_width, screen_height))
+        bg_video_path = prepared_video_path(bg_video_path, (screen_width, screen_height)) or bg_video_path
+        self.bg_video = VideoPlayer(self.video_label, bg_video_path, (screen_width, screen_height))
         self.bg_video.play()
+        # Nothing to draw while the window is minimised
+        self.root.bind("<Unmap>", lambda e: self.bg_video.set_covered("minimised", True) if e.widget is root else None, add="+")
+        self.root.bind("<Map>", lambda e: self.bg_video.set_covered("minimised", False) if e.widget is root else None, add="+")
+
+        # Video stats readout (F6)
+        self.video_stats = tk.Label(root, text="", font=("Consolas", 11), bg="black", fg="#7CFC00", justify="left")
 
         # Content frame
         main_frame = tk.Frame(root, bg="#FF8C42", bd=5, relief="ridge")
@@ -65,10 +54,27 @@ class JokeApp:
         self.main_frame = main_frame  # store for timer placement
 
         self.levels = ["easy", "medium", "hard"]
-        self.current_level_index = 0
+        # Jokes come from randomJokes.txt, split into levels by thirds
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        try:
+            self.corpus = JokeCorpus(os.path.join(script_dir, "randomJokes.txt"), self.levels, index_dir=CACHE_DIR)
+        except OSError as error:
+            messagebox.showerror("⚠️ Jokes Missing", f"Could not open randomJokes.txt: {error} 😢")
+            self.root.destroy()
+            return
+        self.sampler = JokeSampler(self.corpus, os.path.join(script_dir, "joke_state.json"))
+        # Level progress is the sampler's saved position, so a restart carries on where it stopped
+        self.current_level_index = self.next_level_index(0)
+        if self.current_level_index is None:  # every level finished last time
+            self.start_over()
         self.current_level = self.levels[self.current_level_index]
-        self.index = 0
         self.current_joke = None
+        self.typewriter = Typewriter(root)
+
+        # Spoken jokes: the next few are rendered in the background before they are told
+        self.speaker = JokeSpeaker(root, os.path.join(CACHE_DIR, "speech"), channel=pygame.mixer.Channel(0))
+        self.root.bind("<Destroy>", lambda e: self.speaker.close() if e.widget is root else None, add="+")
+        self.prefetch_speech()
 
         # TIMER VARIABLES
         self.timer_value = 7
@@ -144,6 +150,15 @@ class JokeApp:
 
     # -------------------------------
 
+    def toggle_video_stats(self, event=None):
+        if self.bg_video.on_stats:
+            self.bg_video.on_stats = None
+            self.video_stats.place_forget()
+        else:
+            self.bg_video.on_stats = lambda text: self.video_stats.config(text=text)
+            self.video_stats.config(text=self.bg_video.readout())
+            self.video_stats.place(x=10, rely=1.0, y=-10, anchor="sw")
+
     def create_button(self, parent, text, command, column):
         btn = tk.Button(parent, text=text, font=("Tahoma", 16, "bold"),
                         bg="#23C4C4", fg="white", padx=15, pady=8,
@@ -152,18 +167,23 @@ class JokeApp:
         btn.bind("<Enter>", lambda e: btn.config(bg="#1CA3A3"))
         btn.bind("<Leave>", lambda e: btn.config(bg="#23C4C4"))
 
-    # Animate text
-    def animate_text(self, label, text, index=0):
-        if index <= len(text):
-            label.config(text=text[:index])
-            self.root.after(30, lambda: self.animate_text(label, text, index+1))
+    # Animate text (restarting cancels the animation already on that label)
+    def animate_text(self, label, text):
+        self.typewriter.start(label, text)
 
     # Show setup
     def tell_joke(self):
-        self.current_joke = jokes[self.current_level][self.index]
+        if self.current_joke is None:  # Same joke again until Next is pressed
+            if self.corpus.level_count(self.current_level) == 0:
+                messagebox.showinfo("😶 No Jokes", "There are no jokes to tell! Add some to randomJokes.txt 📝")
+                return
+            self.current_joke = self.sampler.draw(self.current_level)
+        self.typewriter.cancel(self.punch_label)
         self.punch_label.config(text="")
 
         self.animate_text(self.setup_label, self.current_joke[0])
+        self.speaker.speak(self.current_joke[0])
+        self.prefetch_speech()
 
         # Start 7-sec timer
         self.start_timer()
@@ -178,8 +198,10 @@ class JokeApp:
         self.stop_timer()
 
         self.animate_text(self.punch_label, self.current_joke[1])
+        if self.speaker.speak(self.current_joke[1]):
+            return
 
-        # Play punchline sound
+        # No speech: play the punchline sound instead
         punch_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "punchline.mp3")
         if os.path.exists(punch_path):
             sound = pygame.mixer.Sound(punch_path)
@@ -187,31 +209,52 @@ class JokeApp:
         else:
             messagebox.showwarning("⚠️ Audio Missing", f"Punchline audio not found: {punch_path} 😢")
 
+    # Render speech for the current punchline and the next jokes in this level
+    def prefetch_speech(self, count=3):
+        lines = [self.current_joke[1]] if self.current_joke else []
+        for setup, punchline in self.sampler.peek(self.current_level, count):
+            lines += [setup, punchline]
+        self.speaker.prefetch(lines)
+
+    # First level from start on with jokes not told yet in its order (None if there is none)
+    def next_level_index(self, start):
+        for i in range(start, len(self.levels)):
+            level = self.levels[i]
+            if self.sampler.drawn(level) < self.corpus.level_count(level):
+                return i
+        return None
+
+    # New order for every level, back to the first one with jokes
+    def start_over(self):
+        for level in self.levels:
+            self.sampler.start_over(level)
+        self.current_level_index = self.next_level_index(0) or 0
+        self.current_level = self.levels[self.current_level_index]
+
     # Next joke
     def next_joke(self):
         self.stop_timer()
 
-        self.index += 1
-        if self.index >= len(jokes[self.current_level]):
-            if self.current_level_index + 1 < len(self.levels):
-                self.current_level_index += 1
-                self.current_level = self.levels[self.current_level_index]
-                self.index = 0
+        # A level ends when its order runs out, so no joke repeats within it
+        if self.sampler.drawn(self.current_level) >= self.corpus.level_count(self.current_level):
+            following = self.next_level_index(self.current_level_index + 1)
+            if following is not None:
+                self.current_level_index = following
+                self.current_level = self.levels[following]
                 self.level_up_animation()
             else:
-                messagebox.showinfo("🔄 Restart", "All levels completed! Restarting Easy… 🐣")
-                self.current_level_index = 0
-                self.current_level = "easy"
-                self.index = 0
+                self.start_over()
+                messagebox.showinfo("🔄 Restart", f"All levels completed! Restarting {self.current_level.title()}… 🐣")
 
         self.level_label.config(text=f"Level: {self.current_level.title()}")
         self.update_progress_bar()
+        self.current_joke = None
         self.tell_joke()
 
     # Progress bar update
     def update_progress_bar(self):
-        total = sum(len(jokes[l]) for l in self.levels)
-        done = sum(len(jokes[self.levels[i]]) for i in range(self.current_level_index)) + self.index
+        total = len(self.corpus)
+        done = self.corpus.done_before(self.current_level) + self.sampler.drawn(self.current_level)  # O(1)
         self.progress["maximum"] = total
         self.progress["value"] = done
 
@@ -222,84 +265,70 @@ class JokeApp:
             self.root.destroy()
 
     # -------------------------------
-    # LEVEL UP ANIMATION (KEPT SAME)
+    # LEVEL UP ANIMATION
     # -------------------------------
+    # Every effect is a tween on self.clock in one group, so closing the
+    # overlay stops them all together. The welcome notice is drawn on the
+    # canvas instead of a messagebox, which would freeze the animation.
     def level_up_animation(self):
-        canvas = tk.Canvas(self.root, width=self.root.winfo_screenwidth(),
-                           height=self.root.winfo_screenheight(), bg="#FF8C42", highlightthickness=0)
+        if self.level_up is not None and self.level_up.winfo_exists():
+            self.level_up.destroy()  # a newer level-up replaces one still showing
+        group = self.clock.group()
+        w, h = self.screen_width, self.screen_height
+        canvas = self.level_up = tk.Canvas(self.root, width=w, height=h, bg="#FF8C42", highlightthickness=0)
         canvas.place(x=0, y=0)
+        self.bg_video.set_covered("level up", True)  # the overlay hides the whole video
+
+        def closed(event):
+            if event.widget is canvas:
+                group.cancel()
+                self.bg_video.set_covered("level up", False)
+
+        canvas.bind("<Destroy>", closed, add="+")
+        canvas.bind("<Button-1>", lambda e: canvas.destroy())  # click to skip
 
         level_emojis = {"EASY": ["🤣","🦆","🍕","🐸","😂"],
                         "MEDIUM": ["😂","😎","🤖","🦄"],
                         "HARD": ["🔥","💥","💣","⚡"]}
 
-        confetti = []
-        for _ in range(200):
-            x = random.randint(0, self.root.winfo_screenwidth())
-            y = random.randint(-800, 0)
-            size = random.randint(20, 40)
-            emoji = random.choice(level_emojis.get(self.current_level.upper(), ["✨"]))
-            confetti.append([canvas.create_text(x, y, text=emoji, font=("Arial", size)),
-                             random.randint(3, 12),
-                             random.choice([-2, 2])])
-
-        def animate_confetti():
-            for c, speed, dx in confetti:
-                canvas.move(c, dx, speed)
-                pos = canvas.coords(c)
-                if pos[1] > self.root.winfo_screenheight():
-                    canvas.move(c, 0, -self.root.winfo_screenheight() - random.randint(20, 100))
-            self.root.after(50, animate_confetti)
-
-        animate_confetti()
+        # One image layer for all the confetti
+        ConfettiLayer(canvas, w, h, level_emojis.get(self.current_level.upper(), ["✨"]), group)
 
         banner = canvas.create_text(
-            self.root.winfo_screenwidth() // 2, -100,
+            w // 2, -100,
             text=f"LEVEL UP! {self.current_level.upper()}",
             font=("Comic Sans MS", 60, "bold"),
             fill="#831943"
         )
 
-        def animate_banner(y=-100):
-            if y < self.root.winfo_screenheight() // 4:
-                y += 10
-                canvas.coords(banner, self.root.winfo_screenwidth() // 2, y)
-                self.root.after(50, lambda: animate_banner(y))
-            else:
-                pulse_banner(1.0)
+        # Drop in, pulse bigger, then fade into the background
+        def drop(p):
+            canvas.coords(banner, w // 2, -100 + (h // 4 + 100) * p)
 
-        def pulse_banner(scale):
-            if scale < 1.5:
-                canvas.itemconfig(banner, font=("Comic Sans MS", int(60 * scale), "bold"))
-                scale += 0.05
-                self.root.after(100, lambda: pulse_banner(scale))
-            else:
-                fade_banner(1.0)
-
-        def fade_banner(alpha):
-            if alpha > 0:
-                try:
-                    canvas.itemconfig(banner, fill=f"#FF1493{int(alpha * 255):02x}")
-                except:
-                    pass
-                self.root.after(100, lambda: fade_banner(alpha - 0.05))
-            else:
-                canvas.delete(banner)
+        def pulse(p):
+            canvas.itemconfig(banner, font=("Comic Sans MS", int(60 * (1 + 0.5 * p)), "bold"))
 
-        animate_banner()
+        def fade(p):
+            canvas.itemconfig(banner, fill=blend("#FF1493", "#FF8C42", p))
 
-        def flash_bg(times=0):
-            if times < 8:
-                canvas.config(bg=random.choice(["#FFF59D", "#FFCCBC", "#B2DFDB", "#E1BEE7"]))
-                self.root.after(150, lambda: flash_bg(times + 1))
-            else:
-                canvas.config(bg="#FF8C42")
+        group.tween(1.0, drop, ease=ease_out, done=lambda: group.tween(
+            1.0, pulse, done=lambda: group.tween(2.0, fade, done=lambda: canvas.delete(banner))))
+
+        flash_colours = [random.choice(["#FFF59D", "#FFCCBC", "#B2DFDB", "#E1BEE7"]) for _ in range(8)]
+
+        def flash_bg(p):
+            canvas.config(bg=flash_colours[min(int(p * 8), 7)] if p < 1 else "#FF8C42")
 
-        flash_bg()
+        group.tween(1.2, flash_bg)
 
-        self.root.after(5500, lambda: canvas.destroy())
+        # Welcome notice (non-blocking)
+        notice = canvas.create_text(w // 2, h // 2, text=f"🎉 Welcome to {self.current_level.upper()} level! 🚀\n(click to continue)",
+                                    font=("Comic Sans MS", 28, "bold"), fill="#831943", justify="center")
+        x1, y1, x2, y2 = canvas.bbox(notice)
+        box = canvas.create_rectangle(x1 - 30, y1 - 20, x2 + 30, y2 + 20, fill="#FFF59D", outline="#831943", width=4)
+        canvas.tag_lower(box, notice)
 
-        messagebox.showinfo("🎉 Level Up!", f"Welcome to {self.current_level.upper()} level! 🚀")
+        group.after(5.5, canvas.destroy)
 
 # ==========================
 # START PAGE
@@ -318,8 +347,9 @@ class StartPage:
 
         w = root.winfo_screenwidth()
         h = root.winfo_screenheight()
-        self.player = tkvideo(video_path, self.video_label, loop=1, size=(w, h))
-        self.player.play()
+        video_path = prepared_video_path(video_path, (w, h)) or video_path
+        self.player = VideoPlayer(self.video_label, video_path, (w, h))
+        self.player.play()  # stops itself when the label is destroyed
 
         self.start_btn = tk.Button(root, text=" Let’s Go! 🚀", font=("Tahoma", 18, "bold"),
                                    bg="#831943", fg="white", padx=25, pady=12,
@@ -339,6 +369,7 @@ class StartPage:
 # ==========================
 if __name__ == "__main__":
     pygame.mixer.init()
+    pygame.mixer.set_reserved(1)  # channel 0 is kept for speech
     root = tk.Tk()
 
     music_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "background.mp3")
@@ -0,0 +1,184 @@
+"""One frame clock for all of JokeApp's overlay animations.
+
+Instead of every effect rescheduling itself with its own after() chain,
+animations register with the clock and a single tick runs them all. Each
+tick has a time budget; animations left over when it runs out are carried
+to the next frame (tweens follow the wall clock, so a skipped frame only
+makes them jump, never slow down). Animations belong to groups, and
+cancelling a group stops all of its animations at once. The clock only
+ticks while something is running, and it records the timing of recent
+frames for tuning.
+"""
+import time
+import tkinter as tk
+from collections import deque
+
+
+def linear(p):
+    return p
+
+
+def ease_out(p):
+    return 1 - (1 - p) ** 3
+
+
+def blend(start, end, p):
+    """Colour between two #RRGGBB colours, p from 0 (start) to 1 (end)."""
+    a = [int(start[i:i + 2], 16) for i in (1, 3, 5)]
+    b = [int(end[i:i + 2], 16) for i in (1, 3, 5)]
+    return "#" + "".join(f"{round(x + (y - x) * p):02x}" for x, y in zip(a, b))
+
+
+# ==========================
+# ANIMATIONS
+# ==========================
+class Tween:
+    """Calls update(progress 0..1) each frame for duration seconds, then done()."""
+
+    def __init__(self, group, duration, update=None, done=None, ease=linear, delay=0.0):
+        self.group = group
+        self.duration = duration
+        self.update = update
+        self.done = done
+        self.ease = ease
+        self.start = time.perf_counter() + delay
+
+    def step(self, now):
+        """True once finished."""
+        if now < self.start:
+            return False
+        p = min((now - self.start) / self.duration, 1.0) if self.duration > 0 else 1.0
+        if self.update:
+            self.update(self.ease(p))
+        if p < 1.0:
+            return False
+        if self.done:
+            self.done()
+        return True
+
+
+class FrameCallback:
+    """Calls func(seconds since its last call) every frame until its group is cancelled."""
+
+    def __init__(self, group, func):
+        self.group = group
+        self.func = func
+        self.last = time.perf_counter()
+
+    def step(self, now):
+        self.func(now - self.last)
+        self.last = now
+        return False
+
+
+class AnimationGroup:
+    def __init__(self, clock):
+        self.clock = clock
+        self.cancelled = False
+
+    def tween(self, duration, update=None, done=None, ease=linear, delay=0.0):
+        return self.clock.add(Tween(self, duration, update, done, ease, delay))
+
+    def after(self, seconds, func):
+        """Runs func once, seconds from now (cancelled with the group)."""
+        return self.tween(seconds, done=func)
+
+    def every_frame(self, func):
+        return self.clock.add(FrameCallback(self, func))
+
+    def cancel(self):
+        self.cancelled = True
+
+
+# ==========================
+# CLOCK
+# ==========================
+class AnimationClock:
+    def __init__(self, root, fps=60, budget_ms=8.0, history=600):
+        self.root = root
+        self.interval_ms = max(1, round(1000 / fps))
+        self.budget = budget_ms / 1000
+        self.animations = []
+        self.next_index = 0  # where the last over-budget frame stopped
+        self.after_id = None
+        self.due = None
+        self.frames = deque(maxlen=history)  # (late ms, work ms, animations run, animations deferred)
+
+    def group(self):
+        return AnimationGroup(self)
+
+    def add(self, animation):
+        self.animations.append(animation)
+        if self.after_id is None:
+            self.due = time.perf_counter()
+            self.after_id = self.root.after_idle(self._tick)
+        return animation
+
+    def cancel_all(self):
+        for animation in self.animations:
+            animation.group.cancel()
+
+    def _tick(self):
+        started = time.perf_counter()
+        late_ms = (started - self.due) * 1000
+        self.animations = [a for a in self.animations if not a.group.cancelled]
+        count = len(self.animations)
+        finished = set()
+        ran = 0
+        for offset in range(count):
+            if ran and time.perf_counter() - started > self.budget:
+                break
+            index = (self.next_index + offset) % count
+            animation = self.animations[index]
+            if animation.group.cancelled:  # cancelled by an earlier animation this frame
+                continue
+            try:
+                if animation.step(started):
+                    finished.add(index)
+            except tk.TclError:  # its widgets are gone
+                animation.group.cancel()
+            ran += 1
+        deferred = count - ran
+        self.next_index = (self.next_index + ran) % count if deferred and count else 0
+        if finished:
+            self.animations = [a for i, a in enumerate(self.animations) if i not in finished]
+            self.next_index = 0
+        work_ms = (time.perf_counter() - started) * 1000
+        self.frames.append((late_ms, work_ms, ran, deferred))
+
+        if any(not a.group.cancelled for a in self.animations):
+            delay = max(1, int(self.interval_ms - work_ms))
+            self.due = started + (work_ms + delay) / 1000
+            self.after_id = self.root.after(delay, self._tick)
+        else:
+            self.animations = []
+            self.after_id = None  # idle until something is added
+
+    def report(self):
+        """Frame timing summary for the recent frames."""
+        if not self.frames:
+            return "animation clock: no frames yet"
+        late = sorted(f[0] for f in self.frames)
+        work = sorted(f[1] for f in self.frames)
+        n = len(self.frames)
+        over = sum(1 for f in self.frames if f[3])
+        return (f"animation clock: {n} frames, work p50 {work[n // 2]:.2f} ms, p95 {work[n * 95 // 100]:.2f} ms, "
+                f"max {work[-1]:.2f} ms; late p50 {late[n // 2]:.1f} ms, p95 {late[n * 95 // 100]:.1f} ms; "
+                f"{over} frames over budget ({self.budget * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    # python animation_clock.py  - a few groups on one clock, one cancelled early (no display needed)
+    root = tk.Tcl()
+    clock = AnimationClock(root)
+    seen = []
+    first, second = clock.group(), clock.group()
+    first.tween(0.3, lambda p: None, done=lambda: seen.append("first tween done"))
+    first.every_frame(lambda dt: None)
+    second.tween(0.2, done=lambda: second.tween(0.2, done=lambda: seen.append("second chained done")))
+    second.after(0.5, lambda: first.cancel())
+    second.after(0.6, lambda: seen.append("second after done"))
+    while clock.after_id is not None:
+        root.dooneevent()
+    print(seen)
+    print(clock.report())
@@ -0,0 +1,147 @@
+"""Random-access joke corpus backed by randomJokes.txt.
+
+Each non-blank line is one joke, "setup?punchline", split on the first
+"?". The file is memory-mapped and a streaming pass records where every
+line starts; that offset index is saved in a sidecar file (checked
+against the text file's size and mtime), so later opens just map the
+index too and cost the same for 36 jokes or 36 million. A joke is only
+read and decoded when it is asked for.
+
+Jokes are split into levels by position in the file (first third easy,
+and so on), with prefix counts for O(1) progress.
+"""
+import array
+import mmap
+import os
+import struct
+
+HEADER = struct.Struct("<8sQqQc7x")  # magic, text size, text mtime_ns, jokes, offset typecode
+MAGIC = b"JOKEIDX1"
+
+
+class JokeCorpus:
+    def __init__(self, path, levels=("easy", "medium", "hard"), index_dir=None):
+        self.path = path
+        self.levels = list(levels)
+        index_dir = index_dir or os.path.dirname(os.path.abspath(path))
+        self.index_path = os.path.join(index_dir, os.path.basename(path) + ".idx")
+
+        self._file = open(path, "rb")
+        stat = os.fstat(self._file.fileno())
+        self._text = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        self._index_file = None
+        self._index_map = None
+        self.offsets = self._load_index(stat) if stat.st_size else array.array("I")
+        if self.offsets is None:
+            self.offsets = self._build_index(stat)
+
+        # Level k holds jokes prefix[k] .. prefix[k+1]-1
+        total = len(self.offsets)
+        self.prefix = [total * k // len(self.levels) for k in range(len(self.levels) + 1)]
+
+    # ---------- index ----------
+    def _load_index(self, stat):
+        """Maps the sidecar index if it matches the text file, else None."""
+        try:
+            index_file = open(self.index_path, "rb")
+        except OSError:
+            return None
+        try:
+            index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, size, mtime_ns, count, typecode = HEADER.unpack_from(index_map)
+            typecode = typecode.decode()
+            expected = HEADER.size + count * array.array(typecode).itemsize
+            if (magic, size, mtime_ns, len(index_map)) != (MAGIC, stat.st_size, stat.st_mtime_ns, expected):
+                raise ValueError("stale joke index")
+        except (ValueError, struct.error, LookupError):
+            index_file.close()
+            return None
+        self._index_file, self._index_map = index_file, index_map
+        return memoryview(index_map)[HEADER.size:].cast(typecode)
+
+    def _build_index(self, stat):
+        """One streaming pass over the text recording where each joke starts."""
+        offsets = array.array("I" if stat.st_size < 2 ** 32 else "Q")
+        text, end = self._text, stat.st_size
+        pos = 0
+        while pos < end:
+            newline = text.find(b"\n", pos)
+            if newline == -1:
+                newline = end
+            if text[pos:newline].strip():
+                offsets.append(pos)
+            pos = newline + 1
+
+        tmp = self.index_path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets), offsets.typecode.encode()))
+                offsets.tofile(f)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass  # read-only folder: just rebuild next time
+        return offsets
+
+    # ---------- access ----------
+    def __len__(self):
+        return len(self.offsets)
+
+    def joke(self, number):
+        """(setup, punchline) of joke number (0-based, across all levels)."""
+        start = self.offsets[number]
+        end = self._text.find(b"\n", start)
+        line = self._text[start:end if end != -1 else len(self._text)].decode("utf-8").strip()
+        setup, mark, punchline = line.partition("?")
+        return setup + mark, punchline.strip()
+
+    def level_count(self, level):
+        k = self.levels.index(level)
+        return self.prefix[k + 1] - self.prefix[k]
+
+    def level_joke(self, level, index):
+        return self.joke(self.prefix[self.levels.index(level)] + index)
+
+    def done_before(self, level):
+        """How many jokes come before this level (for progress)."""
+        return self.prefix[self.levels.index(level)]
+
+    def close(self):
+        if isinstance(self.offsets, memoryview):
+            self.offsets.release()
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_file.close()
+        if isinstance(self._text, mmap.mmap):
+            self._text.close()
+        self._file.close()
+
+
+if __name__ == "__main__":
+    # python joke_corpus.py [lines]  - open and lookup times on a synthetic corpus
+    import sys
+    import tempfile
+    import time
+
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "jokes.txt")
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "randomJokes.txt"), "rb") as f:
+            sample = [line for line in f.read().splitlines(keepends=True) if line.strip()]
+        with open(path, "wb") as f:
+            for i in range(0, lines, len(sample)):
+                f.writelines(sample[:lines - i])
+        print(f"{lines:,} jokes, {os.path.getsize(path) / 1e6:.0f} MB")
+
+        for label in ("first open (builds index)", "second open (maps index)"):
+            started = time.perf_counter()
+            corpus = JokeCorpus(path)
+            print(f"{label}: {(time.perf_counter() - started) * 1000:.1f} ms")
+            corpus.close()
+
+        corpus = JokeCorpus(path)
+        started = time.perf_counter()
+        for i in range(0, len(corpus), max(len(corpus) // 10000, 1)):
+            corpus.joke(i)
+        print(f"random lookup: {(time.perf_counter() - started) / 10000 * 1e6:.1f} us per joke")
+        print(corpus.level_joke("hard", 0))
+        corpus.close()
@@ -0,0 +1,142 @@
+"""Random joke order without repeats, per level, that survives restarts.
+
+Each level has a shuffle bag: a keyed pseudo-random permutation of its
+jokes plus a cursor. Drawing returns permutation[cursor] and moves the
+cursor on, so every joke in the level comes up exactly once before any
+repeats. When the bag runs out a new key starts a fresh order.
+
+The permutation is computed rather than stored (a 4-round Feistel
+network with cycle walking), so a draw is O(1) and a bag is three
+integers however big the level is. No seen-bitmap is needed, because
+the cursor already says exactly which jokes have been drawn. The state
+is saved as a tiny JSON file after each draw.
+"""
+import json
+import os
+import secrets
+
+MASK64 = (1 << 64) - 1
+
+
+def _mix(z):
+    """SplitMix64 finaliser: a fast, well-spread 64-bit hash."""
+    z = (z + 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+class ShuffleBag:
+    def __init__(self, size, key=None, cursor=0, rounds=4):
+        self.size = size
+        self.cursor = cursor
+        self.rounds = rounds
+        # Smallest even bit width covering 0..size-1; cycle walking skips values >= size
+        half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._half_mask = (1 << half_bits) - 1
+        self.reshuffle(key)
+        self.cursor = cursor
+
+    def reshuffle(self, key=None):
+        self.key = secrets.randbits(64) if key is None else key
+        self._round_keys = [_mix(self.key + r) for r in range(self.rounds)]
+        self.cursor = 0
+
+    def _feistel(self, x):
+        left, right = x >> self._half_bits, x & self._half_mask
+        for round_key in self._round_keys:
+            left, right = right, left ^ (_mix(right ^ round_key) & self._half_mask)
+        return (left << self._half_bits) | right
+
+    def permute(self, i):
+        """Position i of this bag's order (a value in 0..size-1)."""
+        value = self._feistel(i)
+        while value >= self.size:  # at most a few steps on average (domain < 4 * size)
+            value = self._feistel(value)
+        return value
+
+    def draw(self):
+        if self.size == 0:
+            raise IndexError("draw from an empty bag")
+        if self.cursor >= self.size:
+            self.reshuffle()  # every item has been drawn: start a new order
+        value = self.permute(self.cursor)
+        self.cursor += 1
+        return value
+
+    @property
+    def remaining(self):
+        return self.size - self.cursor
+
+
+class JokeSampler:
+    """One shuffle bag per corpus level, persisted to state_path."""
+
+    def __init__(self, corpus, state_path):
+        self.corpus = corpus
+        self.state_path = state_path
+        saved = {}
+        try:
+            with open(state_path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            pass
+        self.bags = {}
+        for level in corpus.levels:
+            size = corpus.level_count(level)
+            state = saved.get(level)
+            if state and state.get("size") == size and 0 <= state.get("cursor", -1) <= size:
+                self.bags[level] = ShuffleBag(size, state["key"], state["cursor"])
+            else:  # new level, or the corpus changed size: start a new order
+                self.bags[level] = ShuffleBag(size)
+
+    def draw(self, level):
+        """(setup, punchline) of the next unseen joke in level."""
+        number = self.bags[level].draw()
+        self.save()
+        return self.corpus.level_joke(level, number)
+
+    def drawn(self, level):
+        """How many jokes of level its current order has handed out."""
+        return self.bags[level].cursor
+
+    def start_over(self, level):
+        """A fresh order for level, so all of its jokes can come up again."""
+        self.bags[level].reshuffle()
+        self.save()
+
+    def peek(self, level, count):
+        """The next count jokes draw(level) will return, without drawing them."""
+        bag = self.bags[level]
+        return [self.corpus.level_joke(level, bag.permute(i))
+                for i in range(bag.cursor, min(bag.cursor + count, bag.size))]
+
+    def save(self):
+        state = {level: {"size": bag.size, "key": bag.key, "cursor": bag.cursor}
+                 for level, bag in self.bags.items()}
+        tmp = self.state_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_path)
+        except OSError:
+            pass  # not saved: the order just starts over next time
+
+
+if __name__ == "__main__":
+    # python joke_sampler.py  - no repeats, and draw speed on a 10M-joke level
+    import time
+
+    for size in (1, 2, 3, 37, 1000, 100_003):
+        bag = ShuffleBag(size, key=size)
+        drawn = [bag.draw() for _ in range(size)]
+        assert sorted(drawn) == list(range(size)), size
+    print("every item exactly once per round: ok")
+
+    bag = ShuffleBag(10_000_000)
+    started = time.perf_counter()
+    for _ in range(100_000):
+        bag.draw()
+    elapsed = time.perf_counter() - started
+    print(f"10M-joke bag: {elapsed / 100_000 * 1e6:.2f} us per draw, state = 3 integers")
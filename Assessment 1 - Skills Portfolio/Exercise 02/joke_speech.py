@@ -0,0 +1,293 @@
+"""Spoken jokes: offline text-to-speech rendered ahead of time.
+
+Speech is synthesised with pyttsx3 (SAPI5 / NSSpeechSynthesizer / espeak,
+no network) in a small pool of worker processes, each with its own
+engine, since the engines are not safe to share between threads. The app
+asks for the next few jokes in advance, so by the time a joke is told its
+audio is normally already on disk and starts at once.
+
+The wav files live in a content-addressed cache: the name is the SHA-1 of
+the text and the voice settings, so the same line is only rendered once
+and changing the voice just makes new entries. The cache is bounded in
+size and the least recently played files are deleted first.
+"""
+import hashlib
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import pyttsx3
+except ImportError:
+    pyttsx3 = None  # no speech: the app falls back to punchline.mp3
+
+FORMAT_VERSION = 1  # bump to ignore files made by an older renderer
+STALE_TMP_SECONDS = 3600  # a .tmp this old belongs to a render that died, not one in progress
+
+
+# ==========================
+# CONTENT-ADDRESSED CACHE
+# ==========================
+class SpeechCache:
+    """wav files named by content hash, evicted least recently used past max_bytes."""
+
+    def __init__(self, directory, max_bytes=100 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> size in bytes, oldest use first
+        self.total = 0
+        os.makedirs(directory, exist_ok=True)
+        # The file mtime is the last time it was played, so the order survives restarts
+        found = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".wav"):
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+            elif entry.name.endswith(".tmp"):
+                try:  # another app instance may still be writing recent ones
+                    if time.time() - entry.stat().st_mtime > STALE_TMP_SECONDS:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+        for _, key, size in sorted(found):
+            self.entries[key] = size
+            self.total += size
+
+    @staticmethod
+    def key(text, voice):
+        """Content address of text spoken with voice settings (a dict)."""
+        settings = "|".join(f"{name}={voice[name]}" for name in sorted(voice))
+        return hashlib.sha1(f"v{FORMAT_VERSION}|{settings}|{text}".encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".wav")
+
+    def get(self, key):
+        """Path of the cached wav (marking it recently used), or None."""
+        with self._lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:  # deleted behind our back
+            with self._lock:
+                self.total -= self.entries.pop(key, 0)
+            return None
+        return path
+
+    def put(self, key, tmp_path):
+        """Moves a finished render into the cache, then evicts down to max_bytes."""
+        path = self.path(key)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            self.total += size - self.entries.pop(key, 0)
+            self.entries[key] = size
+            evicted = []
+            while self.total > self.max_bytes and len(self.entries) > 1:
+                old, old_size = self.entries.popitem(last=False)
+                self.total -= old_size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.remove(self.path(old))
+            except OSError:
+                pass
+        return path
+
+
+# ==========================
+# WORKER PROCESSES
+# ==========================
+_engine = None
+
+
+def _start_engine(voice):
+    global _engine
+    _engine = pyttsx3.init()
+    for name, value in voice.items():
+        if value is not None:
+            _engine.setProperty(name, value)
+
+
+def _render(text, path):
+    _engine.save_to_file(text, path)
+    _engine.runAndWait()
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        raise OSError(f"speech engine wrote nothing for {text!r}")
+    return path
+
+
+# ==========================
+# SPEAKER
+# ==========================
+class JokeSpeaker:
+    """Speaks lines through pygame, rendering them in the background first.
+
+    speak() returns False when the line cannot be spoken (no engine, or
+    rendering it failed), so the caller can play something else instead.
+    Renders finish on the pool's thread but are only played from the Tk
+    thread: finished keys go through a queue that an after() poll drains.
+    """
+
+    def __init__(self, root, cache_dir, voice=None, workers=2, max_bytes=100 * 2**20, channel=None):
+        self.root = root
+        self.voice = voice or {"rate": 165, "volume": 1.0, "voice": None}
+        self.cache = SpeechCache(cache_dir, max_bytes)
+        self.channel = channel  # pygame Channel for speech (None: any free channel)
+        self.pending = {}  # key -> Future of a render in progress
+        self.failed = set()
+        self.wanted = None  # key to play as soon as its render finishes (Tk thread only)
+        self._sounds = OrderedDict()  # key -> pygame Sound, the last few used (Tk thread only)
+        self._finished = queue.SimpleQueue()  # keys rendered on the pool's thread
+        self._poll_id = None
+        self._lock = threading.Lock()  # guards pending and failed
+        self.pool = None
+        if pyttsx3 is not None:
+            # Spawned, not forked: the app process has Tk, SDL and video threads running
+            self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=_start_engine, initargs=(self.voice,))
+
+    @property
+    def available(self):
+        return self.pool is not None
+
+    def prefetch(self, texts):
+        """Queues renders for texts not yet cached, in the given order."""
+        if not self.available:
+            return
+        for text in texts:
+            key = self.cache.key(text, self.voice)
+            with self._lock:
+                if key in self.pending or key in self.failed or self.cache.get(key):
+                    continue
+                tmp = self.cache.path(key) + f".{os.getpid()}.tmp"
+                future = self.pool.submit(_render, text, tmp)
+                self.pending[key] = future
+            future.add_done_callback(lambda done, key=key, tmp=tmp: self._rendered(key, tmp, done))
+            self._start_polling()
+
+    def _rendered(self, key, tmp, future):
+        """Runs on the pool's thread when a render finishes: files it, nothing else."""
+        try:
+            future.result()
+            self.cache.put(key, tmp)
+        except Exception:  # engine missing a voice, disk full, pool shut down...
+            with self._lock:
+                self.pending.pop(key, None)
+                self.failed.add(key)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        with self._lock:
+            self._finished.put(key)  # queued before leaving pending, so the poll cannot miss it
+            self.pending.pop(key, None)
+
+    def _start_polling(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(50, self._poll)
+
+    def _poll(self):
+        """Tk thread: plays the wanted line once its render has finished."""
+        self._poll_id = None
+        while True:
+            try:
+                key = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            if key == self.wanted:
+                self.wanted = None
+                self._play(key)
+        with self._lock:
+            busy = bool(self.pending)
+        if busy:
+            self._start_polling()
+
+    def speak(self, text):
+        """Plays text now if it is rendered, or as soon as it is. False if it never will be."""
+        if not self.available:
+            return False
+        key = self.cache.key(text, self.voice)
+        with self._lock:
+            if key in self.failed:
+                return False
+        self.wanted = None  # a newer line replaces one still waiting
+        if self.cache.get(key):
+            return self._play(key)
+        self.prefetch([text])
+        with self._lock:
+            if key in self.pending:
+                self.wanted = key
+                return True
+        return bool(self.cache.get(key)) and self._play(key)  # finished in between
+
+    def _play(self, key):
+        import pygame
+        try:
+            sound = self._sounds.pop(key, None) or pygame.mixer.Sound(self.cache.path(key))
+        except (pygame.error, FileNotFoundError):
+            return False
+        self._sounds[key] = sound
+        while len(self._sounds) > 8:
+            self._sounds.popitem(last=False)
+        if self.channel is not None:
+            self.channel.play(sound)  # cuts off the previous line
+        else:
+            sound.play()
+        return True
+
+    def stop(self):
+        self.wanted = None
+        if self.channel is not None:
+            self.channel.stop()
+
+    def close(self):
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+
+if __name__ == "__main__":
+    # python joke_speech.py  - LRU eviction of the cache, and render times if pyttsx3 is installed
+    import tempfile
+    import tkinter as tk
+
+    with tempfile.TemporaryDirectory() as folder:
+        cache = SpeechCache(folder, max_bytes=3000)
+        keys = [SpeechCache.key(f"line {i}", {"rate": 165}) for i in range(5)]
+        for key in keys[:3]:
+            with open(cache.path(key) + ".tmp", "wb") as f:
+                f.write(b"\0" * 1000)
+            cache.put(key, cache.path(key) + ".tmp")
+        cache.get(keys[0])  # played again: now the most recent
+        with open(cache.path(keys[3]) + ".tmp", "wb") as f:
+            f.write(b"\0" * 1000)
+        cache.put(keys[3], cache.path(keys[3]) + ".tmp")
+        print("kept:", [keys.index(k) for k in cache.entries], f"({cache.total} bytes)")  # line 1 evicted
+
+        if pyttsx3 is None:
+            print("pyttsx3 is not installed: pip install pyttsx3")
+        else:
+            speaker = JokeSpeaker(tk.Tcl(), folder)
+            lines = ["Why did the chicken cross the road?", "To get to the other side!"]
+            started = time.perf_counter()
+            speaker.prefetch(lines)
+            for key in [SpeechCache.key(line, speaker.voice) for line in lines]:
+                future = speaker.pending.get(key)
+                if future:
+                    future.exception()
+            print(f"rendered {len(lines)} lines in {time.perf_counter() - started:.2f} s (includes engine start)")
+            started = time.perf_counter()
+            hits = [speaker.cache.get(SpeechCache.key(line, speaker.voice)) for line in lines]
+            print(f"cache lookups: {(time.perf_counter() - started) * 1000:.2f} ms, all cached: {all(hits)}")
+            speaker.close()
@@ -0,0 +1,62 @@
+"""Typewriter text effect for Tk labels.
+
+One animation per label: starting a new one on a label cancels the one
+already running there. Progress comes from elapsed time, not from counting
+ticks, so a late frame shows several new characters at once instead of
+falling behind. Long texts type faster so an animation never lasts longer
+than max_seconds; that caps the number of label updates, keeping the total
+work linear in the text length.
+"""
+import time
+
+
+class Typewriter:
+    def __init__(self, root, interval_ms=30, chars_per_second=33, max_seconds=2.5):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.chars_per_second = chars_per_second
+        self.max_seconds = max_seconds
+        self.animations = {}  # label -> [after id, text, start time, chars per second, chars shown, on_done]
+
+    def start(self, label, text, on_done=None):
+        """Types text into label, replacing any animation running on it."""
+        self.cancel(label)
+        rate = max(self.chars_per_second, len(text) / self.max_seconds)
+        self.animations[label] = [None, text, time.perf_counter(), rate, -1, on_done]
+        self._tick(label)
+
+    def _tick(self, label):
+        animation = self.animations.get(label)
+        if animation is None:
+            return
+        _, text, started, rate, shown, on_done = animation
+        count = min(len(text), int((time.perf_counter() - started) * rate))
+        if count != shown:
+            label.config(text=text[:count])
+            animation[4] = count
+        if count < len(text):
+            animation[0] = self.root.after(self.interval_ms, self._tick, label)
+        else:
+            del self.animations[label]
+            if on_done:
+                on_done()
+
+    def finish(self, label):
+        """Shows the whole text at once."""
+        animation = self.animations.get(label)
+        if animation:
+            self.cancel(label)
+            label.config(text=animation[1])
+
+    def cancel(self, label):
+        """Stops the animation on label, leaving the text as it is."""
+        animation = self.animations.pop(label, None)
+        if animation and animation[0]:
+            self.root.after_cancel(animation[0])
+
+    def cancel_all(self):
+        for label in list(self.animations):
+            self.cancel(label)
+
+    def running(self, label):
+        return label in self.animations
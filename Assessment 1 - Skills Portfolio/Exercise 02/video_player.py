@@ -0,0 +1,286 @@
+"""Background video player with an adaptive quality governor.
+
+A worker thread decodes the clip with OpenCV, scales it to the current
+quality level and converts it to RGB; the Tk side only shows the newest
+frame. Once a second the governor looks at how much of the Tk thread went
+on showing frames and how late the event loop ran the player's own after()
+calls (a stand-in for input latency). If the loop is late or too busy it
+steps down a level: a smaller decode size (shown full screen with Tk's
+integer zoom) or a lower frame rate. After a few calm seconds it steps
+back up. Playback pauses while the video is fully covered.
+"""
+import threading
+import time
+from collections import deque
+
+import cv2
+from PIL import Image, ImageTk
+
+# (zoom, fps) from best to cheapest: frames are decoded at 1/zoom of the screen size
+LEVELS = ((1, 30), (1, 20), (2, 20), (2, 12), (3, 10), (3, 6))
+
+
+# ==========================
+# QUALITY GOVERNOR
+# ==========================
+class QualityGovernor:
+    """Picks a quality level from per-window render time and event-loop lag."""
+
+    def __init__(self, levels=LEVELS, target_lag_ms=50.0, max_busy=0.35, window=1.0, patience=3, history=50):
+        self.levels = levels
+        self.level = 0
+        self.target_lag_ms = target_lag_ms
+        self.max_busy = max_busy  # most of the Tk thread's time video may use
+        self.window = window
+        self.base_patience = self.patience = patience  # calm windows needed before stepping up
+        self.decisions = deque(maxlen=history)  # (time, old level, new level, reason)
+        self.last = {}  # measurements of the last full window
+        self.calm_windows = 0
+        self.hold = 0  # windows to wait after a change before judging again
+        self.since_up = None  # windows since the last step up
+        self.reset_window()
+
+    def reset_window(self):
+        self.window_start = None
+        self.lags = []
+        self.render_ms = 0.0
+        self.frames = 0
+
+    def record_lag(self, ms):
+        self.lags.append(ms)
+
+    def record_render(self, ms):
+        self.render_ms += ms
+        self.frames += 1
+
+    def update(self, now):
+        """Closes the window once it is over (True if it did), changing level if needed."""
+        if self.window_start is None:
+            self.window_start = now
+            return False
+        elapsed = now - self.window_start
+        if elapsed < self.window:
+            return False
+        lags = sorted(self.lags)
+        lag = lags[len(lags) * 9 // 10] if lags else 0.0
+        busy = self.render_ms / 1000 / elapsed
+        self.last = {"lag_p90_ms": lag, "busy": busy, "fps": self.frames / elapsed,
+                     "render_ms": self.render_ms / max(self.frames, 1)}
+        self.reset_window()
+        self.window_start = now
+
+        if self.since_up is not None:
+            self.since_up += 1
+            if self.since_up > 10:  # the last step up held: back to normal patience
+                self.patience, self.since_up = self.base_patience, None
+        if self.hold:
+            self.hold -= 1
+            return True
+        old = self.level
+        if (lag > self.target_lag_ms or busy > self.max_busy) and old < len(self.levels) - 1:
+            self.level += 1
+            reason = f"lag p90 {lag:.0f} ms" if lag > self.target_lag_ms else f"busy {busy:.0%}"
+            if self.since_up is not None and self.since_up <= 3:
+                self.patience = min(self.patience * 2, 60)  # the step up did not fit: wait longer next time
+                self.since_up = None
+        elif lag < self.target_lag_ms / 2 and busy < self.max_busy / 2 and old > 0:
+            self.calm_windows += 1
+            if self.calm_windows < self.patience:
+                return True
+            self.level -= 1
+            self.since_up = 0
+            reason = f"calm for {self.patience} windows"
+        else:
+            self.calm_windows = 0
+            return True
+        self.calm_windows = 0
+        self.hold = 1
+        self.decisions.append((now, old, self.level, reason))
+        return True
+
+    def describe(self):
+        zoom, fps = self.levels[self.level]
+        return f"quality {self.level + 1}/{len(self.levels)} (1/{zoom} size, {fps} fps)"
+
+
+# ==========================
+# VIDEO PLAYER
+# ==========================
+class VideoPlayer:
+    """Loops a clip on a Tk label at a quality the governor can afford."""
+
+    def __init__(self, label, path, size, governor=None):
+        self.label = label
+        self.path = path
+        self.size = size
+        self.governor = governor or QualityGovernor()
+        self.on_stats = None  # called with a one-line readout once per governor window
+        self.decode_ms = 0.0  # moving average, worker side
+
+        self._frame = None  # newest decoded (zoom, RGB array), handed from the worker
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._running = False
+        self._covered = set()  # reasons the video cannot be seen
+        self._thread = None
+        self.after_id = None
+        self.due = None
+
+        self.image = Image.new("RGB", size)
+        self.display = ImageTk.PhotoImage(self.image)
+        self._small = {}  # zoom -> (PIL image, PhotoImage) at the decoded size
+        label.config(image=self.display)
+        label.bind("<Destroy>", self._on_destroy, add="+")
+
+    def play(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"video:{self.path}", daemon=True)
+        self._thread.start()
+        self._schedule(0)
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            self._wake.notify_all()
+        if self.after_id is not None:
+            self.label.after_cancel(self.after_id)
+            self.after_id = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def set_covered(self, reason, covered):
+        """Pauses while any reason (an overlay, a minimised window) hides the video."""
+        with self._lock:
+            was_paused = bool(self._covered)
+            if covered:
+                self._covered.add(reason)
+            else:
+                self._covered.discard(reason)
+            paused = bool(self._covered)
+            self._wake.notify_all()
+        if paused == was_paused or not self._running:
+            return
+        if paused:
+            if self.after_id is not None:
+                self.label.after_cancel(self.after_id)
+                self.after_id = None
+            if self.on_stats:
+                self.on_stats(f"⏸ video paused ({', '.join(sorted(self._covered))})")
+        else:
+            self.governor.reset_window()  # time spent paused says nothing about load
+            self._schedule(0)
+
+    # ---------- worker thread ----------
+    def _run(self):
+        cap = cv2.VideoCapture(self.path)
+        clip_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        position = 0  # index of the next frame the capture will return
+        play_time = 0.0  # seconds of the clip played, not counting pauses
+        last = time.monotonic()
+        while True:
+            with self._lock:
+                while self._running and self._covered:
+                    self._wake.wait()
+                    last = time.monotonic()
+                if not self._running:
+                    break
+            zoom, fps = self.governor.levels[self.governor.level]
+            interval = 1.0 / min(fps, clip_fps)
+            started = time.monotonic()
+            play_time += started - last
+            last = started
+
+            # Stay in real time at lower frame rates: grab() past frames not shown
+            target = int(play_time * clip_fps)
+            while position < target and cap.grab():
+                position += 1
+            ok, frame = cap.read()
+            if not ok:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # loop
+                position, play_time = 0, 0.0
+                if not cap.read()[0]:
+                    break  # unreadable clip
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                continue
+            position += 1
+            width, height = -(-self.size[0] // zoom), -(-self.size[1] // zoom)
+            if frame.shape[1::-1] != (width, height):
+                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            self.decode_ms += 0.1 * ((time.monotonic() - started) * 1000 - self.decode_ms)
+
+            with self._lock:
+                self._frame = (zoom, rgb)  # an unshown older frame is simply dropped
+                self._wake.wait(max(interval - (time.monotonic() - started), 0.0))
+        cap.release()
+
+    # ---------- Tk side ----------
+    def _schedule(self, delay_ms):
+        self.due = time.perf_counter() + delay_ms / 1000
+        self.after_id = self.label.after(delay_ms, self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.governor.record_lag(max(now - self.due, 0.0) * 1000)
+        with self._lock:
+            item, self._frame = self._frame, None
+        if item is not None:
+            self._show(*item)
+            self.governor.record_render((time.perf_counter() - now) * 1000)
+        if self.governor.update(now) and self.on_stats:
+            self.on_stats(self.readout())
+
+        _, fps = self.governor.levels[self.governor.level]
+        spent_ms = (time.perf_counter() - now) * 1000
+        self._schedule(max(1, int(1000 / fps - spent_ms)))
+
+    def _show(self, zoom, rgb):
+        if zoom == 1:
+            self.image.frombytes(rgb)
+            self.display.paste(self.image)
+            return
+        if zoom not in self._small:
+            image = Image.new("RGB", rgb.shape[1::-1])
+            self._small[zoom] = image, ImageTk.PhotoImage(image)
+        image, photo = self._small[zoom]
+        image.frombytes(rgb)
+        photo.paste(image)
+        # Tk scales it up in C straight into the full-screen image
+        self.display.tk.call(str(self.display), "copy", str(photo), "-zoom", zoom, zoom)
+
+    def readout(self):
+        last = self.governor.last
+        text = (f"🎞 {self.governor.describe()} | shown {last.get('fps', 0):.0f} fps | "
+                f"render {last.get('render_ms', 0):.1f} ms | decode {self.decode_ms:.1f} ms | "
+                f"lag p90 {last.get('lag_p90_ms', 0):.0f} ms | Tk busy {last.get('busy', 0):.0%}")
+        if self.governor.decisions:
+            when, old, new, reason = self.governor.decisions[-1]
+            text += f"\nlast change {time.perf_counter() - when:.0f} s ago: {old + 1} -> {new + 1} ({reason})"
+        return text
+
+    def _on_destroy(self, event):
+        if event.widget is self.label:
+            self.stop()
+
+
+if __name__ == "__main__":
+    # python video_player.py  - the governor against a simulated machine (no display needed)
+    # Each level's render cost per frame; the event loop lags when the Tk thread is over-busy.
+    governor = QualityGovernor()
+    render_ms = {0: 14.0, 1: 14.0, 2: 5.0, 3: 5.0, 4: 2.5, 5: 2.5}
+    now = 0.0
+    for second in range(40):
+        other_work = 0.5 if 10 <= second < 20 else 0.1  # a busy spell, e.g. an animation
+        zoom, fps = governor.levels[governor.level]
+        busy = other_work + fps * render_ms[governor.level] / 1000
+        for _ in range(fps):
+            governor.record_render(render_ms[governor.level])
+            governor.record_lag(max(busy - 0.6, 0) * 400)
+        now += 1.0
+        governor.update(now)
+    for when, old, new, reason in governor.decisions:
+        print(f"t={when:4.0f} s: level {old + 1} -> {new + 1} ({reason})")
+    print("final:", governor.describe())
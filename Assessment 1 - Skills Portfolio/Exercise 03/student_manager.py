@@ -1,9 +1,12 @@
 import tkinter as tk
 from tkinter import simpledialog, messagebox, scrolledtext
-from PIL import Image, ImageTk
 import os
+import sys
 import random
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Shared helpers
+from asset_cache import load_scaled_photo  # Screen-sized background images cached on disk
+
 FILENAME = "studentMarks.txt"
 
 # -----------------------------
@@ -296,8 +299,8 @@ image_path = os.path.join(os.path.dirname(__file__), "start.jpg")
 if os.path.exists(image_path):
     screen_width = root.winfo_screenwidth()
     screen_height = root.winfo_screenheight()
-    img = Image.open(image_path).resize((screen_width, screen_height))
-    bg_img = ImageTk.PhotoImage(img)
+    # Scaled once and cached on disk, so later launches skip decoding/resizing
+    bg_img = load_scaled_photo(image_path, (screen_width, screen_height), "BICUBIC", master=root)
     bg_label = tk.Label(start_frame, image=bg_img)
     bg_label.image = bg_img
     bg_label.place(relwidth=1, relheight=1)
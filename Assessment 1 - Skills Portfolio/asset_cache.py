@@ -0,0 +1,181 @@
+"""Shared on-disk cache of background images and videos scaled to the screen size.
+
+The exercises each stretch a full-size JPEG to the screen on every launch.
+Here the scaled result is stored once as a PPM file, which Tk can load
+directly (no JPEG decode, no resampling, no PIL) on later launches.
+
+Background videos are transcoded ahead of time by prepare_assets.py to
+the screen size and a target fps, as intra-frame MJPEG, so playback no
+longer resizes every frame. At runtime prepared_video_path() only looks
+the copy up; it never transcodes.
+
+Cache entries are keyed by the source file's SHA-1, the target size and
+the resampling filter (or fps), so editing or replacing the source simply
+produces a new entry; stale entries for that source are deleted.
+
+The cache is only ever a shortcut: if .asset_cache cannot be created or
+written (a read-only checkout), images are scaled in memory and videos
+play from the original file, as before.
+"""
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tkinter as tk
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".asset_cache")
+INDEX_PATH = os.path.join(CACHE_DIR, "index.json")
+
+
+def _load_index():
+    try:
+        with open(INDEX_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index):
+    tmp = INDEX_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, INDEX_PATH)
+
+
+def source_hash(path):
+    """SHA-1 of the file, re-read only when its size or mtime changes."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    index = _load_index()
+    entry = index.get(path)
+    if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        return entry["sha1"]
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    index[path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest.hexdigest()}
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _save_index(index)
+    except OSError:
+        pass  # cannot write the index: the file is simply hashed again next time
+    return digest.hexdigest()
+
+
+def scaled_image_path(source, size, resample="LANCZOS"):
+    """Returns a cached PPM of source scaled to size, building it if needed.
+
+    Raises OSError if the cache cannot be written.
+    """
+    width, height = size
+    stem = os.path.splitext(os.path.basename(source))[0]
+    sha = source_hash(source)
+    cached = os.path.join(CACHE_DIR, f"{stem}-{sha[:16]}-{width}x{height}-{resample.lower()}.ppm")
+    if os.path.exists(cached):
+        return cached
+
+    image = _scaled_image(source, size, resample)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = cached + ".tmp"
+    try:
+        image.save(tmp, "PPM")
+        os.replace(tmp, cached)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    _prune(stem, sha, ".ppm")
+    return cached
+
+
+def _scaled_image(source, size, resample):
+    from PIL import Image  # only needed on a cache miss
+    image = Image.open(source).convert("RGB")
+    return image.resize(size, Image.Resampling[resample])
+
+
+def _prune(stem, sha, extension):
+    """The source changed: drops entries built from its older versions."""
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(f"{stem}-") and name.endswith(extension) and f"-{sha[:16]}-" not in name:
+            os.remove(os.path.join(CACHE_DIR, name))
+
+
+def load_scaled_photo(source, size, resample="LANCZOS", master=None):
+    """Returns a PhotoImage of source at size, via the on-disk cache when it can be written."""
+    try:
+        return tk.PhotoImage(master=master, file=scaled_image_path(source, size, resample))
+    except OSError:
+        from PIL import ImageTk  # read-only cache: scale in memory every launch
+        return ImageTk.PhotoImage(_scaled_image(source, size, resample), master=master)
+
+
+# ==========================
+# PREPARED VIDEOS
+# ==========================
+def _video_name(source, size, sha, fps="*"):
+    width, height = size
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(CACHE_DIR, f"{stem}-{sha[:16]}-{width}x{height}-{fps}fps.avi")
+
+
+def prepared_video_path(source, size):
+    """Path of a screen-sized copy made by prepare_assets.py, or None."""
+    if not os.path.isdir(CACHE_DIR) or not os.path.exists(source):
+        return None
+    try:
+        matches = glob.glob(_video_name(source, size, source_hash(source)))
+    except OSError:
+        return None  # play the original
+    return matches[0] if matches else None
+
+
+def prepare_video(source, size, fps=30, quality=90):
+    """Transcodes source to size at fps as MJPEG; returns the cached path.
+
+    Uses ffmpeg when it is on PATH, otherwise OpenCV's VideoWriter.
+    """
+    sha = source_hash(source)
+    cached = _video_name(source, size, sha, fps)
+    if os.path.exists(cached):
+        return cached
+    stem = os.path.splitext(os.path.basename(source))[0]
+    for old in glob.glob(_video_name(source, size, sha)):
+        os.remove(old)  # same clip and size, different fps
+    tmp = cached[:-4] + ".tmp.avi"
+
+    if shutil.which("ffmpeg"):
+        width, height = size
+        subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-i", source,
+                        "-vf", f"scale={width}:{height}:flags=lanczos,fps={fps}",
+                        "-c:v", "mjpeg", "-q:v", "3", "-an", tmp], check=True)
+    else:
+        import cv2  # only needed to prepare assets
+        cap = cv2.VideoCapture(source)
+        source_fps = cap.get(cv2.CAP_PROP_FPS) or fps
+        writer = cv2.VideoWriter(tmp, cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+        if not writer.isOpened():
+            cap.release()
+            raise OSError(f"cannot write {tmp}")
+        writer.set(cv2.VIDEOWRITER_PROP_QUALITY, quality)
+        step = source_fps / fps  # > 1 drops frames, < 1 repeats them
+        position = 0.0
+        index = 0
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            while position < index + 1:
+                writer.write(frame)
+                position += step
+            index += 1
+        cap.release()
+        writer.release()
+    os.replace(tmp, cached)
+    _prune(stem, sha, ".avi")
+    return cached
@@ -0,0 +1,94 @@
+"""One-shot asset preparation for the exercises.
+
+Transcodes every background clip to the screen size and a target fps as
+MJPEG (every frame a keyframe, cheap to decode and to rewind) into
+.asset_cache, where math_quiz.py and alexa_joke_teller.py pick the copies
+up automatically. Run it again after changing a clip or the display.
+
+Only clips larger than the screen are prepared. At the same or a lower
+resolution, decoding the original H.264 (plus an upscale) measured about
+as fast as decoding MJPEG at screen size, so a copy would not pay for
+its disk space (MJPEG files are roughly 30x bigger).
+
+    python prepare_assets.py                 # size of this screen, 30 fps
+    python prepare_assets.py --size 1920x1080 --fps 24 --bench
+"""
+import argparse
+import glob
+import os
+import time
+
+from asset_cache import prepare_video
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CLIPS = sorted(glob.glob(os.path.join(HERE, "Exercise 0*", "*.mp4")))
+
+
+def screen_size():
+    import tkinter as tk
+    root = tk.Tk()
+    root.withdraw()
+    size = root.winfo_screenwidth(), root.winfo_screenheight()
+    root.destroy()
+    return size
+
+
+def clip_format(path):
+    import cv2
+    cap = cv2.VideoCapture(path)
+    size = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = round(cap.get(cv2.CAP_PROP_FPS))
+    cap.release()
+    return size, fps
+
+
+def cpu_per_frame(path, size, frames=120):
+    """CPU ms per displayed frame: decode, resize if needed, BGR -> RGB."""
+    import cv2
+    cap = cv2.VideoCapture(path)
+    shown = 0
+    started = time.process_time()
+    while shown < frames:
+        ok, frame = cap.read()
+        if not ok:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            continue
+        if frame.shape[1::-1] != size:
+            frame = cv2.resize(frame, size)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        shown += 1
+    cap.release()
+    return (time.process_time() - started) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcode background videos for this display.")
+    parser.add_argument("--size", help="WIDTHxHEIGHT (default: this screen)")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--bench", action="store_true", help="compare CPU per frame before and after")
+    args = parser.parse_args()
+
+    size = tuple(int(n) for n in args.size.lower().split("x")) if args.size else screen_size()
+    print(f"Preparing {len(CLIPS)} clips for {size[0]}x{size[1]} at {args.fps} fps")
+    for clip in CLIPS:
+        name = os.path.relpath(clip, HERE)
+        (width, height), fps = clip_format(clip)
+        if width <= size[0] and height <= size[1]:
+            print(f"  {name}: {width}x{height} at {fps} fps is not larger than the screen, kept as is")
+            continue
+        started = time.perf_counter()
+        try:
+            prepared = prepare_video(clip, size, args.fps)
+        except OSError as e:  # .asset_cache not writable, or no MJPEG writer
+            print(f"  {name}: not prepared ({e})")
+            continue
+        line = (f"  {name}: {os.path.getsize(clip) // 1024} KB -> {os.path.getsize(prepared) // 1024} KB "
+                f"in {time.perf_counter() - started:.1f} s")
+        if args.bench:
+            before, after = cpu_per_frame(clip, size), cpu_per_frame(prepared, size)
+            line += f"; CPU per frame {before:.2f} ms -> {after:.2f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()